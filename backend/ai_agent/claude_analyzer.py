@@ -1,8 +1,24 @@
-import json
-from typing import Dict, Optional
-from datetime import datetime
+import asyncio
+import functools
+import hashlib
+import io
+import itertools
+import math
+import re
+import time
+from collections import OrderedDict, deque
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+import jsonschema
+import orjson
 import structlog
-from anthropic import AsyncAnthropic
+from anthropic import (
+    AsyncAnthropic,
+    APIConnectionError,
+    APITimeoutError,
+    RateLimitError,
+)
 
 from data.models import (
     SignalType,
@@ -14,7 +30,276 @@ from data.models import (
 )
 from config.settings import settings
 
-logger = structlog.get_logger()
+
+@functools.cache
+def _get_logger():
+    """Create the module logger on first use"""
+    return structlog.get_logger(__name__)
+
+
+# Static strategy and output-format instructions for coin analysis.
+# Sent as a cached system prompt so only the market data varies per call.
+_STATIC_PROMPT_TAIL = """KIAN HOSS STRATEGY PRINCIPLES:
+1. Focus: Buying dips in uptrends (NOT catching falling knives in bear markets)
+2. Timeframe: Swing trades lasting days to weeks
+3. Entry: Only when multiple factors align (technical + macro + risk/reward)
+4. Risk Management: Strict stop losses, position sizing based on confidence
+5. Macro Must Be Supportive: Fed pivot, DXY weakness, risk-on environment
+
+YOUR TASK:
+Provide a comprehensive trading recommendation in STRICT JSON format.
+
+Output MUST be valid JSON with this exact structure:
+{
+  "rating": "STRONG_BUY" | "BUY" | "WEAK_BUY" | "HOLD" | "WEAK_SELL" | "SELL" | "STRONG_SELL",
+  "confidence": 0-100,
+  "timeframe": "SCALP" | "DAY" | "SWING" | "POSITION",
+  "entry_zone_low": <number>,
+  "entry_zone_high": <number>,
+  "target_conservative": <number>,
+  "target_aggressive": <number>,
+  "stop_loss": <number>,
+  "risk_reward_ratio": <number>,
+  "reasoning": "Detailed explanation of the rating...",
+  "key_factors": [
+    "Factor 1",
+    "Factor 2",
+    "Factor 3"
+  ],
+  "risks": [
+    "Risk 1",
+    "Risk 2"
+  ],
+  "position_size_pct": 1-10
+}
+
+RATING GUIDELINES:
+- STRONG_BUY: Highly confident opportunity, multiple bullish confluences, good macro
+- BUY: Solid entry point, favorable conditions
+- WEAK_BUY: Marginal opportunity, some caution
+- HOLD: Wait for better setup, unclear direction
+- WEAK_SELL: Consider taking profits, weakening momentum
+- SELL: Exit recommended, deteriorating conditions
+- STRONG_SELL: Strong exit signal, high downside risk
+
+CONFIDENCE GUIDELINES:
+- 80-100%: Very high conviction, multiple strong signals
+- 60-79%: Good conviction, favorable setup
+- 40-59%: Moderate conviction, mixed signals
+- 20-39%: Low conviction, uncertain
+- 0-19%: Very low conviction, avoid
+
+IMPORTANT:
+- Respond ONLY with valid JSON
+- No markdown code blocks
+- No additional text before or after JSON
+- All numeric fields must be numbers not strings
+- Reasoning should be 2-4 sentences explaining key factors
+- Include specific entry/exit levels based on support/resistance
+- Consider current market conditions and macro environment"""
+
+# A "{" that can start a JSON object: a quoted (or bare, for repair) key,
+# or an empty object - not prose such as "{note}"
+_OBJECT_START_RE = re.compile(r'\{\s*(?:["}]|[A-Za-z_][A-Za-z0-9_]*\s*:)')
+
+
+def _extract_json_object(text: str) -> str:
+    """
+    Extract the first balanced top-level JSON object from text
+
+    Single pass tracking brace depth and string/escape state, so braces
+    inside string values don't end the object early. Falls back to the
+    stripped text when no balanced object is found.
+    """
+    depth = 0
+    start = -1
+    in_string = False
+    escape = False
+
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            if depth > 0:
+                in_string = True
+        elif char == "{":
+            if depth == 0:
+                if not _OBJECT_START_RE.match(text, i):
+                    continue
+                start = i
+            depth += 1
+        elif char == "}" and depth > 0:
+            depth -= 1
+            # An empty "{}" can't be the response object; keep looking
+            if depth == 0 and text[start + 1:i].strip():
+                return text[start:i + 1]
+
+    return text.strip()
+
+
+# Parsed rating/timeframe strings to enum members (unknown values fall back)
+_RATING_MAP = {s.value: s for s in SignalType}
+_TIMEFRAME_MAP = {t.value: t for t in Timeframe}
+
+# Expected shape of a coin analysis response
+_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "required": ["rating", "confidence", "timeframe", "reasoning"],
+    "properties": {
+        "rating": {"enum": [s.value for s in SignalType]},
+        "confidence": {"type": "integer", "minimum": 0, "maximum": 100},
+        "timeframe": {"enum": [t.value for t in Timeframe]},
+        "entry_zone_low": {"type": ["number", "null"]},
+        "entry_zone_high": {"type": ["number", "null"]},
+        "target_conservative": {"type": ["number", "null"]},
+        "target_aggressive": {"type": ["number", "null"]},
+        "stop_loss": {"type": ["number", "null"]},
+        "risk_reward_ratio": {"type": ["number", "null"]},
+        "reasoning": {"type": "string"},
+        "key_factors": {"type": "array", "items": {"type": "string"}},
+        "risks": {"type": "array", "items": {"type": "string"}},
+        "position_size_pct": {"type": ["number", "null"]},
+    },
+}
+_ANALYSIS_VALIDATOR = jsonschema.Draft7Validator(_ANALYSIS_SCHEMA)
+
+# Per-field validators, so a streamed field is only surfaced once it's valid
+_FIELD_VALIDATORS = {
+    name: jsonschema.Draft7Validator(schema)
+    for name, schema in _ANALYSIS_SCHEMA["properties"].items()
+}
+
+# Streamed values converted to what the AIAnalysis attribute holds
+_FIELD_CONVERTERS = {"rating": _RATING_MAP.get, "timeframe": _TIMEFRAME_MAP.get}
+
+# Common LLM JSON slips: trailing commas and unquoted object keys
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_UNQUOTED_KEY_RE = re.compile(r"([{,]\s*)([A-Za-z_][A-Za-z0-9_]*)\s*:")
+
+# API errors worth retrying (rate limits, timeouts, dropped connections)
+TRANSIENT_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError)
+
+
+class AnalysisSchemaError(Exception):
+    """Claude returned a response that is not a valid analysis object"""
+
+    def __init__(self, errors: List[str], response_text: str):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+        self.response_text = response_text
+
+
+class IncrementalJsonParser:
+    """
+    Incremental parser for a streamed JSON object
+
+    Scans each chunk exactly once, tracking brace/bracket depth and
+    string/escape state, and decodes every top-level member as soon as
+    its value closes. Text before the opening brace (e.g. a markdown
+    fence) and after the closing brace is ignored; a "{" only opens the
+    object when the next non-space character is '"' or "}". Members that fail to
+    decode are recorded in `errors`; the object is then not usable as is.
+    """
+
+    def __init__(self):
+        # (offset, chunk) pairs from the start of the current member onwards
+        self._chunks: deque = deque()
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start: Optional[int] = None
+        self._opening = False  # Saw a top-level "{", waiting to confirm it
+        self.fields: Dict[str, Any] = {}
+        self.errors: List[str] = []
+        self.complete = False
+
+    def feed(self, chunk: str) -> Dict[str, Any]:
+        """
+        Feed the next chunk of streamed text
+
+        Args:
+            chunk: Newly received text
+
+        Returns:
+            Top-level fields decoded so far
+        """
+        if self.complete or not chunk:
+            return self.fields
+
+        offset = self._length
+        self._chunks.append((offset, chunk))
+        self._length += len(chunk)
+
+        for i, char in enumerate(chunk, start=offset):
+            if self._opening:
+                if char.isspace():
+                    continue
+                self._opening = False
+                if char == '"' or char == "}":
+                    self._depth = 1
+                # Otherwise that "{" was prose; scan this char at depth 0
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                if self._depth > 0:
+                    self._in_string = True
+            elif char == "{" and self._depth == 0:
+                self._opening = True
+                self._member_start = i + 1
+            elif char in "{[" and self._depth > 0:
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 0:
+                    continue
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_member(i)
+                    # An empty "{}" can't be the response object; keep looking
+                    if self.fields or self.errors:
+                        self.complete = True
+                        break
+            elif char == "," and self._depth == 1:
+                self._close_member(i)
+                self._member_start = i + 1
+
+        return self.fields
+
+    def _close_member(self, end: int):
+        """Decode the `"key": value` member ending at `end`"""
+        start = self._member_start
+
+        # Drop chunks wholly before this member; earlier members are decoded
+        chunks = self._chunks
+        while chunks and chunks[0][0] + len(chunks[0][1]) <= start:
+            chunks.popleft()
+
+        # Slice just this member's text out of the chunks it spans
+        parts = []
+        for offset, chunk in chunks:
+            if offset >= end:
+                break
+            parts.append(chunk[max(start - offset, 0):end - offset])
+
+        member = "".join(parts).strip()
+        if not member:
+            return
+
+        try:
+            self.fields.update(orjson.loads("{" + member + "}"))
+        except orjson.JSONDecodeError as e:
+            self.errors.append(f"Invalid member {member[:40]!r}: {e}")
 
 
 class ClaudeAnalyzer:
@@ -28,10 +313,51 @@ class ClaudeAnalyzer:
     - Kian Hoss strategy integration
     """
 
+    # Reuse analyses of near-identical inputs for this long (seconds)
+    ANALYSIS_CACHE_TTL = 300
+
+    # Maximum number of analyses kept in memory (LRU)
+    ANALYSIS_CACHE_SIZE = 512
+
+    # Retry transient API failures with exponential backoff
+    MAX_ATTEMPTS = 3
+    RETRY_BASE_DELAY = 1.0
+
+    # Maximum number of trade explanations kept in memory (LRU)
+    EXPLAIN_CACHE_SIZE = 512
+
     def __init__(self):
-        """Initialize Claude client"""
-        self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        """Initialize analyzer config (client is created lazily)"""
+        self.api_key = settings.ANTHROPIC_API_KEY
         self.model = settings.CLAUDE_MODEL
+        self.explain_model = settings.CLAUDE_EXPLAIN_MODEL
+        self._client: Optional[AsyncAnthropic] = None
+        self._cache: OrderedDict[str, tuple] = OrderedDict()  # key -> (timestamp, AIAnalysis)
+        self._explain_cache: OrderedDict = OrderedDict()
+
+    async def _get_client(self) -> AsyncAnthropic:
+        """Get or create Claude client with a pooled HTTP/2 transport"""
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=100,
+                    keepalive_expiry=30.0,
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+            )
+            self._client = AsyncAnthropic(
+                api_key=self.api_key, http_client=http_client
+            )
+
+        return self._client
+
+    async def aclose(self):
+        """Close Claude client and its connection pool"""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
 
     async def analyze_coin(
         self,
@@ -39,6 +365,7 @@ class ClaudeAnalyzer:
         price_data: CoinPrice,
         technical: TechnicalIndicators,
         macro: Optional[MacroContext] = None,
+        field_futures: Optional[Dict[str, asyncio.Future]] = None,
     ) -> AIAnalysis:
         """
         Comprehensive coin analysis
@@ -48,34 +375,59 @@ class ClaudeAnalyzer:
             price_data: Current price data
             technical: Technical indicators
             macro: Macro context (optional)
+            field_futures: Futures keyed by AIAnalysis field name (e.g.
+                "rating"). Each is resolved as soon as that field streams in
+                and passes its schema check. Early values are provisional:
+                a later retry, repair or whole-object validation failure may
+                supersede them. The returned analysis is authoritative. Fields
+                that never stream are resolved from it, including the
+                HOLD fallback on error, so futures never raise.
 
         Returns:
             AI analysis with rating and reasoning
         """
         try:
+            # Near-duplicate inputs reuse a recent analysis instead of calling Claude
+            cache_key = self._cache_key(coin, price_data, technical, macro)
+            analysis = self._cache_get(cache_key)
+            if analysis is not None:
+                _get_logger().info("claude_analysis_cache_hit", coin=coin)
+                self._resolve_futures(field_futures, analysis)
+                return analysis
+
             prompt = self._build_coin_analysis_prompt(
                 coin, price_data, technical, macro
             )
 
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=settings.CLAUDE_MAX_TOKENS,
-                temperature=0.7,  # Some creativity but mostly factual
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            # Parse Claude's response
-            analysis_text = response.content[0].text
-
-            # Extract JSON from response
-            analysis_data = self._parse_analysis_response(analysis_text)
+            # Stream Claude's response and parse JSON as it arrives
+            try:
+                analysis_data = await self._stream_analysis(
+                    coin, prompt, field_futures=field_futures
+                )
+            except AnalysisSchemaError as e:
+                # One repair round trip before giving up
+                _get_logger().warning(
+                    "claude_analysis_invalid", coin=coin, errors=e.errors
+                )
+                analysis_data = await self._stream_analysis(
+                    coin,
+                    "Your previous response did not validate: "
+                    f"{'; '.join(e.errors)}. Return ONLY valid JSON.",
+                    field_futures=field_futures,
+                    history=[
+                        {"role": "user", "content": prompt},
+                        {"role": "assistant", "content": e.response_text or "{}"},
+                    ],
+                )
 
             # Build AIAnalysis object
-            return AIAnalysis(
+            analysis = AIAnalysis(
                 coin=coin,
-                rating=SignalType(analysis_data.get("rating", "HOLD")),
+                rating=_RATING_MAP.get(analysis_data.get("rating"), SignalType.HOLD),
                 confidence=analysis_data.get("confidence", 50),
-                timeframe=Timeframe(analysis_data.get("timeframe", "SWING")),
+                timeframe=_TIMEFRAME_MAP.get(
+                    analysis_data.get("timeframe"), Timeframe.SWING
+                ),
                 entry_zone_low=analysis_data.get("entry_zone_low"),
                 entry_zone_high=analysis_data.get("entry_zone_high"),
                 target_conservative=analysis_data.get("target_conservative"),
@@ -88,11 +440,19 @@ class ClaudeAnalyzer:
                 position_size_pct=analysis_data.get("position_size_pct"),
             )
 
+            self._cache[cache_key] = (time.time(), analysis)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self.ANALYSIS_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+            self._resolve_futures(field_futures, analysis)
+            return analysis
+
         except Exception as e:
-            logger.error("claude_analysis_error", coin=coin, error=str(e))
+            _get_logger().error("claude_analysis_error", coin=coin, error=str(e))
 
             # Return default HOLD rating on error
-            return AIAnalysis(
+            fallback = AIAnalysis(
                 coin=coin,
                 rating=SignalType.HOLD,
                 confidence=0,
@@ -101,149 +461,308 @@ class ClaudeAnalyzer:
                 key_factors=[],
                 risks=["Unable to analyze due to error"],
             )
+            self._resolve_futures(field_futures, fallback)
+            return fallback
 
-    def _build_coin_analysis_prompt(
+    async def analyze_coins(
+        self,
+        batch: List[
+            tuple[str, CoinPrice, TechnicalIndicators, Optional[MacroContext]]
+        ],
+        concurrency: int = 10,
+    ) -> List[AIAnalysis]:
+        """
+        Analyze several coins concurrently
+
+        Args:
+            batch: (coin, price_data, technical, macro) tuples
+            concurrency: Maximum number of in-flight Claude calls
+
+        Returns:
+            AI analyses in the same order as the batch
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def analyze_one(args) -> AIAnalysis:
+            async with semaphore:
+                return await self.analyze_coin(*args)
+
+        return await asyncio.gather(*(analyze_one(args) for args in batch))
+
+    def _cache_get(self, cache_key: str) -> Optional[AIAnalysis]:
+        """Read a cached analysis, dropping it if expired"""
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            return None
+
+        timestamp, analysis = cached
+        if time.time() - timestamp >= self.ANALYSIS_CACHE_TTL:
+            del self._cache[cache_key]
+            return None
+
+        self._cache.move_to_end(cache_key)
+        return analysis
+
+    def _cache_key(
         self,
         coin: str,
         price_data: CoinPrice,
         technical: TechnicalIndicators,
         macro: Optional[MacroContext],
     ) -> str:
-        """Build comprehensive analysis prompt for Claude"""
+        """
+        Build a quantized cache key for an analysis request
+
+        Indicators move slowly between polls, so inputs are bucketed
+        (RSI to the unit, price to 3 significant digits, EMAs as % distance
+        from price, macro values to the unit) and equal keys share a result.
+        """
+        price = price_data.price
+        histogram = technical.macd_histogram
+
+        def pct_from_price(value: Optional[float]):
+            if value is None or not price:
+                return None
+            return round((value / price - 1) * 100)
+
+        parts = [
+            coin,
+            _round_sig(price),
+            _round_or_none(technical.rsi),
+            None if histogram is None else ("BULL" if histogram > 0 else "BEAR"),
+            pct_from_price(technical.ema_20),
+            pct_from_price(technical.ema_50),
+            pct_from_price(technical.ema_200),
+        ]
 
-        # Format macro context
-        macro_text = "Not available"
         if macro:
-            macro_text = f"""
-DXY (Dollar Index): {macro.dxy} - Trend: {macro.dxy_trend or 'Unknown'}
-VIX (Market Fear): {macro.vix}
-Fed Funds Rate: {macro.fed_funds_rate}%
-Fear & Greed Index: {macro.fear_greed_index}/100
-Market Phase: {macro.market_phase or 'Unknown'}
-"""
-
-        prompt = f"""Analyze {coin} for swing trading opportunity following Kian Hoss's strategy.
-
-CURRENT PRICE DATA:
-Symbol: {coin}
-Price: ${price_data.price:,.2f}
-24h Change: {price_data.change_24h:+.2f}%
-7d Change: {price_data.change_7d:+.2f}% (if available)
-24h Volume: ${price_data.volume_24h:,.0f}
-24h High: ${price_data.high_24h:,.2f}
-24h Low: ${price_data.low_24h:,.2f}
-
-TECHNICAL INDICATORS:
-RSI: {technical.rsi:.1f}
-MACD: {technical.macd:.2f} (Signal: {technical.macd_signal:.2f}, Histogram: {technical.macd_histogram:.2f})
-Bollinger Bands:
-  - Upper: ${technical.bb_upper:,.2f}
-  - Middle: ${technical.bb_middle:,.2f}
-  - Lower: ${technical.bb_lower:,.2f}
-EMA 20: ${technical.ema_20:,.2f if technical.ema_20 else 'N/A'}
-EMA 50: ${technical.ema_50:,.2f if technical.ema_50 else 'N/A'}
-EMA 200: ${technical.ema_200:,.2f if technical.ema_200 else 'N/A'}
-Volume Ratio: {technical.volume_ratio:.2f}x average (if available)
+            parts += [
+                _round_or_none(macro.dxy),
+                _round_or_none(macro.vix),
+                macro.fear_greed_index,
+            ]
 
-MACRO CONTEXT:
-{macro_text}
+        return "|".join(str(p) for p in parts)
 
-KIAN HOSS STRATEGY PRINCIPLES:
-1. Focus: Buying dips in uptrends (NOT catching falling knives in bear markets)
-2. Timeframe: Swing trades lasting days to weeks
-3. Entry: Only when multiple factors align (technical + macro + risk/reward)
-4. Risk Management: Strict stop losses, position sizing based on confidence
-5. Macro Must Be Supportive: Fed pivot, DXY weakness, risk-on environment
+    async def _stream_analysis(
+        self,
+        coin: str,
+        prompt: str,
+        field_futures: Optional[Dict[str, asyncio.Future]] = None,
+        history: Optional[List[Dict]] = None,
+    ) -> Dict:
+        """
+        Stream and validate a coin analysis, retrying transient API errors
 
-YOUR TASK:
-Provide a comprehensive trading recommendation in STRICT JSON format.
+        Raises:
+            AnalysisSchemaError: Response is not a valid analysis object
+        """
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                data, response_text = await self._stream_json(
+                    prompt,
+                    max_tokens=settings.CLAUDE_MAX_TOKENS,
+                    temperature=0.0,  # Deterministic output for strict JSON
+                    field_futures=field_futures,
+                    system=_STATIC_PROMPT_TAIL,
+                    history=history,
+                    strict=True,
+                )
+                break
+            except TRANSIENT_ERRORS as e:
+                if attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+
+                delay = self.RETRY_BASE_DELAY * 2**attempt
+                _get_logger().warning(
+                    "claude_analysis_retry",
+                    coin=coin,
+                    attempt=attempt + 1,
+                    delay=delay,
+                    error=str(e),
+                )
+                await asyncio.sleep(delay)
+
+        errors = [error.message for error in _ANALYSIS_VALIDATOR.iter_errors(data)]
+        if errors:
+            raise AnalysisSchemaError(errors, response_text)
+
+        return data
+
+    async def _stream_json(
+        self,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        field_futures: Optional[Dict[str, asyncio.Future]] = None,
+        system: Optional[str] = None,
+        history: Optional[List[Dict]] = None,
+        strict: bool = False,
+    ) -> Tuple[Dict, str]:
+        """
+        Stream a JSON response from Claude
 
-Output MUST be valid JSON with this exact structure:
-{{
-  "rating": "STRONG_BUY" | "BUY" | "WEAK_BUY" | "HOLD" | "WEAK_SELL" | "SELL" | "STRONG_SELL",
-  "confidence": 0-100,
-  "timeframe": "SCALP" | "DAY" | "SWING" | "POSITION",
-  "entry_zone_low": <number>,
-  "entry_zone_high": <number>,
-  "target_conservative": <number>,
-  "target_aggressive": <number>,
-  "stop_loss": <number>,
-  "risk_reward_ratio": <number>,
-  "reasoning": "Detailed explanation of the rating...",
-  "key_factors": [
-    "Factor 1",
-    "Factor 2",
-    "Factor 3"
-  ],
-  "risks": [
-    "Risk 1",
-    "Risk 2"
-  ],
-  "position_size_pct": 1-10
-}}
+        Args:
+            prompt: User prompt
+            max_tokens: Maximum tokens to generate
+            temperature: Sampling temperature
+            field_futures: Futures provisionally resolved as their fields
+                stream in (see analyze_coin)
+            system: Static system prompt, marked for prompt caching
+            history: Earlier conversation turns to send before the prompt
+            strict: Raise AnalysisSchemaError instead of returning defaults
+                when the response is not JSON
 
-RATING GUIDELINES:
-- STRONG_BUY: Highly confident opportunity, multiple bullish confluences, good macro
-- BUY: Solid entry point, favorable conditions
-- WEAK_BUY: Marginal opportunity, some caution
-- HOLD: Wait for better setup, unclear direction
-- WEAK_SELL: Consider taking profits, weakening momentum
-- SELL: Exit recommended, deteriorating conditions
-- STRONG_SELL: Strong exit signal, high downside risk
+        Returns:
+            Parsed response data and the raw response text
+        """
+        client = await self._get_client()
+        parser = IncrementalJsonParser()
+        chunks = []
+
+        request = {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "messages": (history or []) + [{"role": "user", "content": prompt}],
+        }
+        if system:
+            request["system"] = [
+                {
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ]
 
-CONFIDENCE GUIDELINES:
-- 80-100%: Very high conviction, multiple strong signals
-- 60-79%: Good conviction, favorable setup
-- 40-59%: Moderate conviction, mixed signals
-- 20-39%: Low conviction, uncertain
-- 0-19%: Very low conviction, avoid
+        async with client.messages.stream(**request) as stream:
+            async for text in stream.text_stream:
+                chunks.append(text)
+                fields = parser.feed(text)
+
+                if field_futures:
+                    self._resolve_streamed(field_futures, fields)
+
+        response_text = "".join(chunks)
+
+        if parser.complete and parser.fields and not parser.errors:
+            data = parser.fields
+        else:
+            # No balanced object, or a member didn't decode - fall back to a
+            # full parse (which also repairs common slips, or fails strictly)
+            data = self._parse_analysis_response(response_text, strict=strict)
+
+        return data, response_text
+
+    @staticmethod
+    def _resolve_futures(
+        field_futures: Optional[Dict[str, asyncio.Future]], analysis: AIAnalysis
+    ):
+        """Resolve any pending field futures from the returned analysis"""
+        if not field_futures:
+            return
+
+        for name, future in field_futures.items():
+            if not future.done():
+                future.set_result(getattr(analysis, name, None))
+
+    @staticmethod
+    def _resolve_streamed(
+        field_futures: Dict[str, asyncio.Future], fields: Dict[str, Any]
+    ):
+        """Provisionally resolve pending futures from valid streamed fields"""
+        for name, future in field_futures.items():
+            if future.done() or name not in fields:
+                continue
+
+            validator = _FIELD_VALIDATORS.get(name)
+            value = fields[name]
+            if validator is None or not validator.is_valid(value):
+                continue
+
+            convert = _FIELD_CONVERTERS.get(name)
+            future.set_result(convert(value) if convert else value)
 
-IMPORTANT:
-- Respond ONLY with valid JSON
-- No markdown code blocks
-- No additional text before or after JSON
-- All numeric fields must be numbers not strings
-- Reasoning should be 2-4 sentences explaining key factors
-- Include specific entry/exit levels based on support/resistance
-- Consider current market conditions and macro environment
+    def _build_coin_analysis_prompt(
+        self,
+        coin: str,
+        price_data: CoinPrice,
+        technical: TechnicalIndicators,
+        macro: Optional[MacroContext],
+    ) -> str:
+        """
+        Build the dynamic part of the analysis prompt
 
-Provide your analysis now:"""
+        The static strategy and output-format instructions live in
+        _STATIC_PROMPT_TAIL and are sent as a cached system prompt.
+        """
+        lines = [
+            f"Analyze {coin} for swing trading opportunity following Kian Hoss's strategy.\n",
+            "\nCURRENT PRICE DATA:\n",
+            f"Symbol: {coin}\n",
+            f"Price: {_fmt_usd(price_data.price)}\n",
+            f"24h Change: {price_data.change_24h:+.2f}%\n",
+            f"7d Change: {_fmt_pct(price_data.change_7d)}\n",
+            f"24h Volume: {_fmt_usd(price_data.volume_24h, 0)}\n",
+            f"24h High: {_fmt_usd(price_data.high_24h)}\n",
+            f"24h Low: {_fmt_usd(price_data.low_24h)}\n",
+            "\nTECHNICAL INDICATORS:\n",
+            f"RSI: {technical.rsi:.1f}\n",
+            f"MACD: {technical.macd:.2f} (Signal: {technical.macd_signal:.2f}, "
+            f"Histogram: {technical.macd_histogram:.2f})\n",
+            "Bollinger Bands:\n",
+            f"  - Upper: {_fmt_usd(technical.bb_upper)}\n",
+            f"  - Middle: {_fmt_usd(technical.bb_middle)}\n",
+            f"  - Lower: {_fmt_usd(technical.bb_lower)}\n",
+            f"EMA 20: {_fmt_usd(technical.ema_20)}\n",
+            f"EMA 50: {_fmt_usd(technical.ema_50)}\n",
+            f"EMA 200: {_fmt_usd(technical.ema_200)}\n",
+            "Volume Ratio: "
+            + (
+                f"{technical.volume_ratio:.2f}x average\n"
+                if technical.volume_ratio is not None
+                else "N/A\n"
+            ),
+            "\nMACRO CONTEXT:\n",
+        ]
 
-        return prompt
+        if macro:
+            lines += [
+                f"DXY (Dollar Index): {macro.dxy} - Trend: {macro.dxy_trend or 'Unknown'}\n",
+                f"VIX (Market Fear): {macro.vix}\n",
+                f"Fed Funds Rate: {macro.fed_funds_rate}%\n",
+                f"Fear & Greed Index: {macro.fear_greed_index}/100\n",
+                f"Market Phase: {macro.market_phase or 'Unknown'}\n",
+            ]
+        else:
+            lines.append("Not available\n")
+
+        lines.append("\nProvide your analysis now:")
 
-    def _parse_analysis_response(self, response_text: str) -> Dict:
+        return "".join(lines)
+
+    def _parse_analysis_response(self, response_text: str, strict: bool = False) -> Dict:
         """
         Parse Claude's JSON response
 
         Args:
             response_text: Raw response from Claude
+            strict: Raise AnalysisSchemaError instead of returning defaults
 
         Returns:
             Parsed analysis data
         """
         try:
-            # Try to extract JSON if wrapped in markdown
-            if "```json" in response_text:
-                # Extract JSON from code block
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                json_text = response_text[start:end].strip()
-            elif "```" in response_text:
-                # Extract from generic code block
-                start = response_text.find("```") + 3
-                end = response_text.find("```", start)
-                json_text = response_text[start:end].strip()
-            else:
-                # Assume the whole response is JSON
-                json_text = response_text.strip()
-
-            # Parse JSON
-            data = json.loads(json_text)
-
-            return data
-
-        except json.JSONDecodeError as e:
-            logger.error("json_parse_error", error=str(e), response=response_text[:200])
+            # Parses are cached by response text, so re-parsing is free
+            return dict(_parse_json_response(response_text))
+
+        except orjson.JSONDecodeError as e:
+            _get_logger().error(
+                "json_parse_error", error=str(e), response=response_text[:200]
+            )
+
+            if strict:
+                raise AnalysisSchemaError([f"Invalid JSON: {e}"], response_text)
 
             # Return default values
             return {
@@ -298,18 +817,13 @@ Provide analysis in JSON format:
 
 Respond ONLY with valid JSON:"""
 
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=2048,
-                temperature=0.7,
-                messages=[{"role": "user", "content": prompt}],
+            sentiment, _ = await self._stream_json(
+                prompt, max_tokens=2048, temperature=0.0
             )
-
-            response_text = response.content[0].text
-            return self._parse_analysis_response(response_text)
+            return sentiment
 
         except Exception as e:
-            logger.error("market_sentiment_error", error=str(e))
+            _get_logger().error("market_sentiment_error", error=str(e))
             return {
                 "sentiment": "NEUTRAL",
                 "sentiment_score": 50,
@@ -322,20 +836,19 @@ Respond ONLY with valid JSON:"""
 
     def _format_coin_list(self, coins: list) -> str:
         """Format list of coins for prompt"""
-        if not coins:
-            return "None"
+        buffer = io.StringIO()
+        for c in itertools.islice(coins, 5):
+            buffer.write(f"  - {c.get('symbol', 'N/A')}: {c.get('change_24h', 0):+.2f}%\n")
 
-        return "\n".join(
-            [
-                f"  - {c.get('symbol', 'N/A')}: {c.get('change_24h', 0):+.2f}%"
-                for c in coins[:5]
-            ]
-        )
+        return buffer.getvalue().rstrip("\n") or "None"
 
     async def explain_trade(self, coin: str, signal: SignalType, context: Dict) -> str:
         """
         Generate educational explanation for a trade signal
 
+        Only call this when the explanation is actually shown - it costs a
+        Claude round trip. Results are cached per (coin, signal, context).
+
         Args:
             coin: Coin symbol
             signal: Trading signal
@@ -345,10 +858,31 @@ Respond ONLY with valid JSON:"""
             Educational explanation
         """
         try:
+            # Context dicts may have int or enum keys (json.dumps accepted them)
+            context_hash = hashlib.blake2b(
+                orjson.dumps(
+                    context,
+                    option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+                    default=str,
+                ),
+                digest_size=16,
+            ).digest()
+            cache_key = (coin, signal.value, context_hash)
+
+            if cache_key in self._explain_cache:
+                self._explain_cache.move_to_end(cache_key)
+                return self._explain_cache[cache_key]
+
+            context_json = orjson.dumps(
+                context,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                default=str,
+            ).decode()
+
             prompt = f"""Explain in simple terms why {coin} has a {signal.value} signal.
 
 Context:
-{json.dumps(context, indent=2)}
+{context_json}
 
 Provide a clear, educational explanation (2-3 paragraphs) that helps a trader understand:
 1. WHY this signal was generated
@@ -357,19 +891,81 @@ Provide a clear, educational explanation (2-3 paragraphs) that helps a trader un
 
 Write in a friendly, educational tone. No JSON, just clear text:"""
 
-            response = await self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
+            client = await self._get_client()
+            response = await client.messages.create(
+                model=self.explain_model,
+                max_tokens=512,
                 temperature=0.8,
                 messages=[{"role": "user", "content": prompt}],
             )
 
-            return response.content[0].text
+            explanation = response.content[0].text
+
+            self._explain_cache[cache_key] = explanation
+            if len(self._explain_cache) > self.EXPLAIN_CACHE_SIZE:
+                self._explain_cache.popitem(last=False)
+
+            return explanation
 
         except Exception as e:
-            logger.error("explain_trade_error", error=str(e))
+            _get_logger().error("explain_trade_error", error=str(e))
             return f"Unable to generate explanation for {coin} {signal.value} signal."
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_json_response(text: str) -> MappingProxyType:
+    """
+    Decode the JSON object embedded in a Claude response
+
+    Cached by response text; the read-only proxy keeps cached results
+    from being mutated by callers.
+
+    Raises:
+        orjson.JSONDecodeError: No decodable JSON found
+    """
+    # Pull the first balanced {...} out of markdown or prose wrapping
+    json_text = _extract_json_object(text)
+
+    try:
+        data = orjson.loads(json_text)
+    except orjson.JSONDecodeError:
+        # Retry after fixing trailing commas and unquoted keys
+        data = orjson.loads(_repair_json(json_text))
+
+    return MappingProxyType(data if isinstance(data, dict) else {})
+
+
+def _repair_json(text: str) -> str:
+    """Fix trailing commas and unquoted keys in almost-JSON text"""
+    text = _TRAILING_COMMA_RE.sub(r"\1", text)
+    return _UNQUOTED_KEY_RE.sub(r'\1"\2":', text)
+
+
+def _fmt_usd(value: Optional[float], decimals: int = 2) -> str:
+    """Format a dollar amount for prompts, N/A when missing"""
+    if value is None:
+        return "N/A"
+    return f"${value:,.{decimals}f}"
+
+
+def _fmt_pct(value: Optional[float]) -> str:
+    """Format a signed percentage for prompts, N/A when missing"""
+    if value is None:
+        return "N/A"
+    return f"{value:+.2f}%"
+
+
+def _round_sig(value: float, digits: int = 3) -> float:
+    """Round value to a number of significant digits"""
+    if not value:
+        return 0.0
+    return round(value, digits - 1 - int(math.floor(math.log10(abs(value)))))
+
+
+def _round_or_none(value: Optional[float]) -> Optional[int]:
+    """Round value to the unit, passing None through"""
+    return None if value is None else round(value)
+
+
 # Global Claude analyzer instance
 claude_analyzer = ClaudeAnalyzer()
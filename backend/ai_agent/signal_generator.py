@@ -1,5 +1,7 @@
+import bisect
+import functools
 from typing import Dict, Optional, List
-from datetime import datetime
+import numpy as np
 import structlog
 
 from data.models import (
@@ -12,7 +14,91 @@ from data.models import (
 )
 from indicators.technical import TechnicalIndicators as TechCalc
 
-logger = structlog.get_logger()
+
+@functools.cache
+def _get_logger():
+    """Create the module logger on first use"""
+    return structlog.get_logger(__name__)
+
+
+# Score bins and the signal each bin maps to, weakest first
+_SIGNAL_BINS = (20, 35, 45, 55, 65, 80)
+_SIGNALS = (
+    SignalType.STRONG_SELL,
+    SignalType.SELL,
+    SignalType.WEAK_SELL,
+    SignalType.HOLD,
+    SignalType.WEAK_BUY,
+    SignalType.BUY,
+    SignalType.STRONG_BUY,
+)
+_SIGNAL_INDEX = {signal: i for i, signal in enumerate(_SIGNALS)}
+
+
+def _build_trend_lut() -> tuple:
+    """
+    Trend labels indexed by the signs of the three EMA comparisons
+
+    Index is 9*(price vs EMA200) + 3*(EMA20 vs EMA50) + (EMA50 vs EMA200),
+    each comparison encoded as 0 (<), 1 (==) or 2 (>).
+    """
+    lut = []
+    for price_vs_200 in (-1, 0, 1):
+        for ema20_vs_50 in (-1, 0, 1):
+            for ema50_vs_200 in (-1, 0, 1):
+                if price_vs_200 > 0:
+                    strong = ema20_vs_50 > 0 and ema50_vs_200 > 0
+                    lut.append("STRONG_UPTREND" if strong else "UPTREND")
+                elif price_vs_200 < 0:
+                    strong = ema20_vs_50 < 0 and ema50_vs_200 < 0
+                    lut.append("STRONG_DOWNTREND" if strong else "DOWNTREND")
+                else:
+                    lut.append("SIDEWAYS")
+    return tuple(lut)
+
+
+_TREND_LUT = _build_trend_lut()
+
+# Macro threshold ladders: (low bins, high bins, score deltas). Values below
+# a low bin or above a high bin land in the outer tiers; see _ladder_delta.
+_DXY_LADDER = ((95, 100), (105, 110), (20, 10, 0, -10, -20))
+_VIX_LADDER = ((15, 20), (25, 30), (15, 5, 0, -5, -15))
+_FGI_LADDER = ((25, 40), (60, 75), (15, 5, 0, -5, -15))
+
+
+def _ladder_delta(value: float, ladder: tuple) -> int:
+    """Score delta for value: strict < on low bins, strict > on high bins"""
+    low_bins, high_bins, deltas = ladder
+    return deltas[
+        bisect.bisect_right(low_bins, value) + bisect.bisect_left(high_bins, value)
+    ]
+
+
+def _ladder_deltas(values: np.ndarray, ladder: tuple) -> np.ndarray:
+    """Vectorized _ladder_delta"""
+    low_bins, high_bins, deltas = ladder
+    index = np.searchsorted(low_bins, values, side="right") + np.searchsorted(
+        high_bins, values, side="left"
+    )
+    return np.asarray(deltas)[index]
+
+
+# 24h volatility bins (exclusive upper edges) and position size factors
+_VOLATILITY_BINS = (5, 10)
+_VOLATILITY_FACTORS = (1.0, 0.85, 0.7)
+
+# Per-signal lookups, indexed like _SIGNALS
+_AI_SCORE_BY_SIGNAL = (5, 25, 40, 50, 60, 75, 95)
+_POSITION_BY_SIGNAL = (0.0, 0.0, 0.0, 0.0, 3.0, 7.0, 10.0)
+_ACTION_BY_SIGNAL = (
+    "Exit All Positions (Urgent)",
+    "Exit Long Positions",
+    "Consider Taking Profits",
+    "Wait / Hold Current Positions",
+    "Scale In (Small Position)",
+    "Enter Long Position",
+    "Enter Long Position (High Conviction)",
+)
 
 
 class SignalGenerator:
@@ -65,6 +151,9 @@ class SignalGenerator:
             Multi-layer trading signal
         """
         try:
+            # Validate once here so the scoring helpers can stay exception-free
+            technical = self._validate_technical(technical)
+
             # Calculate layer scores
             technical_score = self._calculate_technical_score(technical)
             macro_score = (
@@ -102,7 +191,8 @@ class SignalGenerator:
             # Estimate timeframe
             timeframe = ai_analysis.timeframe.value if ai_analysis else "7-14 days"
 
-            return MultiLayerSignal(
+            # Every field is computed here, so skip re-validation
+            return MultiLayerSignal.model_construct(
                 coin=coin,
                 signal=signal_type,
                 overall_score=overall_score,
@@ -119,10 +209,10 @@ class SignalGenerator:
             )
 
         except Exception as e:
-            logger.error("signal_generation_error", coin=coin, error=str(e))
+            _get_logger().error("signal_generation_error", coin=coin, error=str(e))
 
             # Return default HOLD signal on error
-            return MultiLayerSignal(
+            return MultiLayerSignal.model_construct(
                 coin=coin,
                 signal=SignalType.HOLD,
                 overall_score=50,
@@ -132,49 +222,258 @@ class SignalGenerator:
                 timeframe="N/A",
             )
 
+    def generate_signals_batch(
+        self,
+        coins: List[str],
+        prices: List[CoinPrice],
+        technicals: List[TechnicalIndicators],
+        ai_analyses: Optional[List[Optional[AIAnalysis]]] = None,
+        macros: Optional[List[Optional[MacroContext]]] = None,
+    ) -> List[MultiLayerSignal]:
+        """
+        Generate signals for many coins at once
+
+        Packs inputs into NumPy arrays and computes every layer score as
+        array operations; same results as calling generate_signal per coin.
+
+        Args:
+            coins: Coin symbols
+            prices: Current price data, aligned with coins
+            technicals: Technical indicators, aligned with coins
+            ai_analyses: Claude AI analyses (entries may be None)
+            macros: Macro contexts (entries may be None)
+
+        Returns:
+            Multi-layer trading signals in input order
+        """
+        n = len(coins)
+        if n == 0:
+            return []
+
+        ai_analyses = ai_analyses or [None] * n
+        macros = macros or [None] * n
+
+        def column(values) -> np.ndarray:
+            return np.array(
+                [np.nan if v is None else v for v in values], dtype=np.float64
+            )
+
+        def present(values: np.ndarray) -> np.ndarray:
+            # Matches the scalar path's truthiness checks (None and 0 skipped)
+            return ~np.isnan(values) & (values != 0)
+
+        # Structure-of-arrays inputs
+        rsi = column(t.rsi for t in technicals)
+        macd_hist = column(t.macd_histogram for t in technicals)
+        ema20 = column(t.ema_20 for t in technicals)
+        ema50 = column(t.ema_50 for t in technicals)
+        ema200 = column(t.ema_200 for t in technicals)
+        bb_upper = column(t.bb_upper for t in technicals)
+        bb_middle = column(t.bb_middle for t in technicals)
+        bb_lower = column(t.bb_lower for t in technicals)
+        volume_ratio = column(t.volume_ratio for t in technicals)
+        change_24h = column(p.change_24h for p in prices)
+
+        has_macro = np.array([m is not None for m in macros])
+        dxy = column(m.dxy if m else None for m in macros)
+        vix = column(m.vix if m else None for m in macros)
+        fgi = column(m.fear_greed_index if m else None for m in macros)
+
+        has_ai = np.array([a is not None for a in ai_analyses])
+        ai_rating_code = np.array(
+            [_SIGNAL_INDEX[a.rating] if a else 0 for a in ai_analyses]
+        )
+        ai_conf = column(a.confidence if a else None for a in ai_analyses)
+
+        with np.errstate(invalid="ignore"):
+            # Technical layer
+            score = np.full(n, 50.0)
+            score += np.where(
+                present(rsi),
+                np.select(
+                    [rsi < 30, rsi < 40, rsi > 70, rsi > 60],
+                    [20, 10, -20, -10],
+                    default=0,
+                ),
+                0,
+            )
+            score += np.where(macd_hist > 0, 20, -20)
+
+            has_emas = ~np.isnan(ema20) & ~np.isnan(ema50) & ~np.isnan(ema200)
+            price = np.nan_to_num(bb_middle)  # BB middle as price proxy
+            score += np.where(
+                has_emas,
+                np.select(
+                    [
+                        price > ema200,
+                        price < ema200,
+                    ],
+                    [
+                        np.where((ema20 > ema50) & (ema50 > ema200), 30, 15),
+                        np.where((ema20 < ema50) & (ema50 < ema200), -30, -15),
+                    ],
+                    default=0,
+                ),
+                0,
+            )
+
+            has_bands = present(bb_upper) & present(bb_middle) & present(bb_lower)
+            score += np.where(
+                has_bands,
+                np.select(
+                    [bb_middle < bb_lower, bb_middle > bb_upper], [15, -15], default=0
+                ),
+                0,
+            )
+
+            bullish = score > 50
+            score += np.where(
+                present(volume_ratio),
+                np.select(
+                    [volume_ratio > 1.5, volume_ratio < 0.5],
+                    [np.where(bullish, 15, -15), np.where(bullish, -5, 5)],
+                    default=0,
+                ),
+                0,
+            )
+            technical_scores = np.clip(score, 0, 100)
+
+            # Macro layer
+            macro_scores = np.clip(
+                50
+                + np.where(present(dxy), _ladder_deltas(dxy, _DXY_LADDER), 0)
+                + np.where(present(vix), _ladder_deltas(vix, _VIX_LADDER), 0)
+                + np.where(present(fgi), _ladder_deltas(fgi, _FGI_LADDER), 0),
+                0,
+                100,
+            )
+
+            # AI sentiment layer
+            ai_base = np.asarray(_AI_SCORE_BY_SIGNAL)[ai_rating_code]
+            sentiment_scores = np.trunc(
+                50 + (ai_base - 50) * np.nan_to_num(ai_conf) / 100
+            )
+
+            # Weighted overall score
+            overall_scores = np.trunc(
+                np.select(
+                    [has_macro & has_ai, has_macro, has_ai],
+                    [
+                        technical_scores * 0.4
+                        + macro_scores * 0.3
+                        + sentiment_scores * 0.3,
+                        technical_scores * 0.6 + macro_scores * 0.4,
+                        technical_scores * 0.6 + sentiment_scores * 0.4,
+                    ],
+                    default=technical_scores,
+                )
+            )
+            signal_codes = np.digitize(overall_scores, bins=_SIGNAL_BINS)
+
+            # Confidence from layer agreement
+            confidence = np.where(has_ai, ai_conf, 50)
+            layers = np.stack(
+                [
+                    technical_scores,
+                    np.where(has_macro, macro_scores, np.nan),
+                    np.where(has_ai, sentiment_scores, np.nan),
+                ]
+            )
+            variance = np.nanvar(layers, axis=0)
+            multi_layer = has_macro | has_ai
+            confidence = np.where(
+                multi_layer & (variance < 100),
+                np.minimum(100, confidence + 10),
+                np.where(
+                    multi_layer & (variance > 400),
+                    np.maximum(0, confidence - 15),
+                    confidence,
+                ),
+            )
+
+            # Position sizing
+            volatility = np.abs(change_24h)
+            position_sizes = (
+                np.asarray(_POSITION_BY_SIGNAL)[signal_codes]
+                * (confidence / 100)
+                * np.asarray(_VOLATILITY_FACTORS)[
+                    np.searchsorted(_VOLATILITY_BINS, volatility, side="left")
+                ]
+            )
+
+        signals = []
+        for i in range(n):
+            signal_type = _SIGNALS[signal_codes[i]]
+            ai_analysis = ai_analyses[i]
+
+            action, entry_zone, targets, stop_loss = self._determine_trade_levels(
+                signal_type, prices[i], technicals[i], ai_analysis
+            )
+
+            signals.append(
+                MultiLayerSignal.model_construct(
+                    coin=coins[i],
+                    signal=signal_type,
+                    overall_score=int(overall_scores[i]),
+                    confidence=int(confidence[i]),
+                    technical_score=int(technical_scores[i]),
+                    macro_score=int(macro_scores[i]) if has_macro[i] else None,
+                    sentiment_score=int(sentiment_scores[i]) if has_ai[i] else None,
+                    action=action,
+                    entry_zone=entry_zone,
+                    targets=targets,
+                    stop_loss=stop_loss,
+                    position_size_pct=round(float(position_sizes[i]), 1),
+                    timeframe=ai_analysis.timeframe.value if ai_analysis else "7-14 days",
+                )
+            )
+
+        return signals
+
+    @staticmethod
+    def _validate_technical(technical: TechnicalIndicators) -> TechnicalIndicators:
+        """Replace missing core indicators with neutral values"""
+        defaults = {
+            "rsi": 50.0,
+            "macd_histogram": 0.0,
+            "volume_ratio": 1.0,
+        }
+        missing = {
+            name: value
+            for name, value in defaults.items()
+            if getattr(technical, name) is None
+        }
+
+        return technical.model_copy(update=missing) if missing else technical
+
     def _calculate_technical_score(self, technical: TechnicalIndicators) -> int:
         """Calculate technical analysis score (0-100)"""
-        try:
-            # Build indicators dict for TechCalc
-            indicators = {
-                "rsi": technical.rsi,
-                "macd_signal": "BULLISH"
-                if technical.macd_histogram > 0
-                else "BEARISH",
-                "trend": self._determine_trend(technical),
-                "bb_signal": self._determine_bb_signal(technical),
-                "volume_ratio": technical.volume_ratio,
-            }
-
-            return TechCalc.calculate_technical_score(indicators)
+        # Build indicators dict for TechCalc
+        indicators = {
+            "rsi": technical.rsi,
+            "macd_signal": "BULLISH" if technical.macd_histogram > 0 else "BEARISH",
+            "trend": self._determine_trend(technical),
+            "bb_signal": self._determine_bb_signal(technical),
+            "volume_ratio": technical.volume_ratio,
+        }
 
-        except Exception as e:
-            logger.error("technical_score_error", error=str(e))
-            return 50  # Neutral on error
+        return TechCalc.calculate_technical_score(indicators)
 
     def _determine_trend(self, technical: TechnicalIndicators) -> str:
         """Determine trend from EMAs"""
-        if not all([technical.ema_20, technical.ema_50, technical.ema_200]):
+        ema_20, ema_50, ema_200 = technical.ema_20, technical.ema_50, technical.ema_200
+        if ema_20 is None or ema_50 is None or ema_200 is None:
             return "UNKNOWN"
 
         current_price = (technical.bb_middle or 0)  # Use BB middle as proxy
 
-        if current_price > technical.ema_200:
-            if (
-                technical.ema_20 > technical.ema_50
-                and technical.ema_50 > technical.ema_200
-            ):
-                return "STRONG_UPTREND"
-            return "UPTREND"
-        elif current_price < technical.ema_200:
-            if (
-                technical.ema_20 < technical.ema_50
-                and technical.ema_50 < technical.ema_200
-            ):
-                return "STRONG_DOWNTREND"
-            return "DOWNTREND"
-        else:
-            return "SIDEWAYS"
+        # Encode the three comparisons as one index into the trend table
+        index = (
+            9 * ((current_price > ema_200) - (current_price < ema_200) + 1)
+            + 3 * ((ema_20 > ema_50) - (ema_20 < ema_50) + 1)
+            + ((ema_50 > ema_200) - (ema_50 < ema_200) + 1)
+        )
+        return _TREND_LUT[index]
 
     def _determine_bb_signal(self, technical: TechnicalIndicators) -> str:
         """Determine Bollinger Bands signal"""
@@ -196,61 +495,24 @@ class SignalGenerator:
         """Calculate macro context score (0-100)"""
         score = 50  # Neutral start
 
-        try:
-            # DXY (Dollar Index) - Inverse correlation with crypto
-            if macro.dxy:
-                if macro.dxy < 95:
-                    score += 20  # Weak dollar = bullish crypto
-                elif macro.dxy < 100:
-                    score += 10
-                elif macro.dxy > 110:
-                    score -= 20  # Strong dollar = bearish crypto
-                elif macro.dxy > 105:
-                    score -= 10
-
-            # VIX (Volatility Index)
-            if macro.vix:
-                if macro.vix < 15:
-                    score += 15  # Low fear = bullish
-                elif macro.vix < 20:
-                    score += 5
-                elif macro.vix > 30:
-                    score -= 15  # High fear = bearish
-                elif macro.vix > 25:
-                    score -= 5
-
-            # Fear & Greed Index
-            if macro.fear_greed_index:
-                fgi = macro.fear_greed_index
-                if fgi < 25:
-                    score += 15  # Extreme fear = buy opportunity
-                elif fgi < 40:
-                    score += 5
-                elif fgi > 75:
-                    score -= 15  # Extreme greed = sell signal
-                elif fgi > 60:
-                    score -= 5
-
-            return max(0, min(100, score))
+        # DXY (Dollar Index) - Inverse correlation with crypto
+        if macro.dxy:
+            score += _ladder_delta(macro.dxy, _DXY_LADDER)
 
-        except Exception as e:
-            logger.error("macro_score_error", error=str(e))
-            return 50
+        # VIX (Volatility Index) - Low fear = bullish
+        if macro.vix:
+            score += _ladder_delta(macro.vix, _VIX_LADDER)
+
+        # Fear & Greed Index - Extreme fear = buy opportunity
+        if macro.fear_greed_index:
+            score += _ladder_delta(macro.fear_greed_index, _FGI_LADDER)
+
+        return max(0, min(100, score))
 
     def _map_ai_to_score(self, ai_analysis: AIAnalysis) -> int:
         """Map AI analysis to sentiment score"""
         # Map signal type to score
-        signal_map = {
-            SignalType.STRONG_BUY: 95,
-            SignalType.BUY: 75,
-            SignalType.WEAK_BUY: 60,
-            SignalType.HOLD: 50,
-            SignalType.WEAK_SELL: 40,
-            SignalType.SELL: 25,
-            SignalType.STRONG_SELL: 5,
-        }
-
-        base_score = signal_map.get(ai_analysis.rating, 50)
+        base_score = _AI_SCORE_BY_SIGNAL[_SIGNAL_INDEX[ai_analysis.rating]]
 
         # Adjust based on confidence
         confidence_factor = ai_analysis.confidence / 100
@@ -288,20 +550,7 @@ class SignalGenerator:
 
     def _score_to_signal_type(self, score: int) -> SignalType:
         """Convert score to signal type"""
-        if score >= 80:
-            return SignalType.STRONG_BUY
-        elif score >= 65:
-            return SignalType.BUY
-        elif score >= 55:
-            return SignalType.WEAK_BUY
-        elif score >= 45:
-            return SignalType.HOLD
-        elif score >= 35:
-            return SignalType.WEAK_SELL
-        elif score >= 20:
-            return SignalType.SELL
-        else:
-            return SignalType.STRONG_SELL
+        return _SIGNALS[bisect.bisect_right(_SIGNAL_BINS, score)]
 
     def _calculate_confidence(
         self,
@@ -374,17 +623,7 @@ class SignalGenerator:
                 stop_loss = None
 
         # Determine action
-        action_map = {
-            SignalType.STRONG_BUY: "Enter Long Position (High Conviction)",
-            SignalType.BUY: "Enter Long Position",
-            SignalType.WEAK_BUY: "Scale In (Small Position)",
-            SignalType.HOLD: "Wait / Hold Current Positions",
-            SignalType.WEAK_SELL: "Consider Taking Profits",
-            SignalType.SELL: "Exit Long Positions",
-            SignalType.STRONG_SELL: "Exit All Positions (Urgent)",
-        }
-
-        action = action_map.get(signal_type, "Hold")
+        action = _ACTION_BY_SIGNAL[_SIGNAL_INDEX[signal_type]]
 
         return action, entry_zone, targets, stop_loss
 
@@ -394,28 +633,17 @@ class SignalGenerator:
         """Recommend position size as % of portfolio"""
 
         # Base position size on signal strength
-        base_size_map = {
-            SignalType.STRONG_BUY: 10.0,
-            SignalType.BUY: 7.0,
-            SignalType.WEAK_BUY: 3.0,
-            SignalType.HOLD: 0.0,
-            SignalType.WEAK_SELL: 0.0,
-            SignalType.SELL: 0.0,
-            SignalType.STRONG_SELL: 0.0,
-        }
-
-        base_size = base_size_map.get(signal_type, 0.0)
+        base_size = _POSITION_BY_SIGNAL[_SIGNAL_INDEX[signal_type]]
 
         # Adjust based on confidence
         confidence_factor = confidence / 100
         adjusted_size = base_size * confidence_factor
 
-        # Consider volatility (24h change)
+        # Consider volatility (24h change) - high volatility shrinks size
         volatility = abs(price_data.change_24h)
-        if volatility > 10:  # High volatility
-            adjusted_size *= 0.7
-        elif volatility > 5:
-            adjusted_size *= 0.85
+        adjusted_size *= _VOLATILITY_FACTORS[
+            bisect.bisect_left(_VOLATILITY_BINS, volatility)
+        ]
 
         return round(adjusted_size, 1)
 
@@ -1,7 +1,14 @@
 import asyncio
-from typing import Dict, List, Optional, Callable
+import inspect
+import random
+import time
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Callable
 from datetime import datetime, timedelta
+import numpy as np
+import orjson
 import structlog
+import binance.streams
 from binance import AsyncClient, BinanceSocketManager
 from binance.exceptions import BinanceAPIException
 
@@ -9,6 +16,26 @@ from api.rate_limiter import rate_limiter
 
 logger = structlog.get_logger()
 
+# python-binance decodes every WebSocket frame with `json.loads` from its
+# streams module (its only use of json there); route that through orjson.
+# orjson.JSONDecodeError subclasses ValueError, which the library catches.
+binance.streams.json = orjson
+
+# Symbol, last price, change %, volume, high, low from a 24hr ticker event
+_TICKER_GET = itemgetter("s", "c", "P", "v", "h", "l")
+
+
+class Tick(NamedTuple):
+    """24h ticker snapshot for one symbol (timestamp is unix seconds)"""
+
+    symbol: str
+    price: float
+    change_24h: float
+    volume_24h: float
+    high_24h: float
+    low_24h: float
+    timestamp: float
+
 
 class BinanceClient:
     """
@@ -21,6 +48,19 @@ class BinanceClient:
     - Error handling with exponential backoff
     """
 
+    __slots__ = (
+        "api_key",
+        "api_secret",
+        "client",
+        "socket_manager",
+        "price_cache",
+        "ws_connected",
+        "ws_callbacks",
+        "ws_sync_callbacks",
+        "_ws_retry_count",
+        "_shutdown",
+    )
+
     def __init__(self, api_key: Optional[str] = None, api_secret: Optional[str] = None):
         """
         Initialize Binance client
@@ -35,11 +75,14 @@ class BinanceClient:
         self.socket_manager: Optional[BinanceSocketManager] = None
 
         # Price cache (updated via WebSocket)
-        self.price_cache: Dict[str, Dict] = {}
+        self.price_cache: Dict[str, Tick] = {}
 
         # WebSocket connection status
         self.ws_connected = False
-        self.ws_callbacks: List[Callable] = []
+        self.ws_callbacks: List[Callable] = []  # Coroutine functions, gathered per tick
+        self.ws_sync_callbacks: List[Callable] = []  # Plain functions, called inline
+        self._ws_retry_count = 0
+        self._shutdown = False
 
     async def connect(self):
         """Initialize Binance async client"""
@@ -61,6 +104,8 @@ class BinanceClient:
 
     async def close(self):
         """Close Binance client connection"""
+        self._shutdown = True
+
         if self.socket_manager:
             try:
                 await self.socket_manager.close()
@@ -72,42 +117,81 @@ class BinanceClient:
 
         logger.info("binance_client_closed")
 
-    async def get_ticker_24h(self, symbol: str) -> Dict:
+    async def get_ticker_24h(self, symbol: str, max_age: float = 2.0) -> Tick:
         """
         Get 24h ticker data
 
+        Served from the WebSocket price cache when the cached entry is
+        younger than max_age, so a live socket costs no rate-limit tokens.
+
         Args:
             symbol: Trading pair (e.g., 'BTCUSDT')
+            max_age: Maximum age in seconds of a cached entry to return
 
         Returns:
-            Dict with price, volume, high, low, change
+            Tick with price, volume, high, low, change and a unix timestamp
         """
+        cached = self.price_cache.get(symbol)
+        if cached and time.time() - cached.timestamp < max_age:
+            return cached
+
         await rate_limiter.acquire("binance", priority="high")
 
         try:
-            ticker = await self.client.get_ticker(symbol=symbol)
-
-            return {
-                "symbol": symbol,
-                "price": float(ticker["lastPrice"]),
-                "change_24h": float(ticker["priceChangePercent"]),
-                "volume_24h": float(ticker["volume"]),
-                "high_24h": float(ticker["highPrice"]),
-                "low_24h": float(ticker["lowPrice"]),
-                "timestamp": datetime.utcnow(),
-            }
+            ticker = self._parse_ticker(await self.client.get_ticker(symbol=symbol))
+            self.price_cache[symbol] = ticker
+            return ticker
 
         except BinanceAPIException as e:
             logger.error("binance_ticker_error", symbol=symbol, error=str(e))
             raise
 
+    async def get_tickers_24h(self, symbols: List[str]) -> List[Tick]:
+        """
+        Get 24h ticker data for many symbols in one request
+
+        Fetches the all-symbols ticker (one round trip, request weight 40)
+        and filters in-process - cheaper than one call per symbol once
+        more than a handful of symbols are needed.
+
+        Args:
+            symbols: Trading pairs (e.g., ['BTCUSDT', 'ETHUSDT'])
+
+        Returns:
+            List of Ticks (see get_ticker_24h) for the known symbols
+        """
+        await rate_limiter.acquire("binance", priority="high", tokens=40)
+
+        try:
+            tickers = await self.client.get_ticker()
+
+            wanted = set(symbols)
+            return [self._parse_ticker(t) for t in tickers if t["symbol"] in wanted]
+
+        except BinanceAPIException as e:
+            logger.error("binance_tickers_error", symbols=len(symbols), error=str(e))
+            raise
+
+    @staticmethod
+    def _parse_ticker(ticker: Dict) -> Tick:
+        """Convert a REST 24h ticker into a Tick"""
+        return Tick(
+            ticker["symbol"],
+            float(ticker["lastPrice"]),
+            float(ticker["priceChangePercent"]),
+            float(ticker["volume"]),
+            float(ticker["highPrice"]),
+            float(ticker["lowPrice"]),
+            time.time(),
+        )
+
     async def get_klines(
         self,
         symbol: str,
         interval: str = "1h",
         limit: int = 100,
         start_time: Optional[datetime] = None,
-    ) -> List[Dict]:
+    ) -> Dict[str, np.ndarray]:
         """
         Get candlestick (kline) data
 
@@ -118,7 +202,8 @@ class BinanceClient:
             start_time: Start time for historical data
 
         Returns:
-            List of OHLCV data
+            Dict of column arrays: "timestamp" (open time, epoch ms) and
+            "open", "high", "low", "close", "volume"
         """
         await rate_limiter.acquire("binance", priority="medium")
 
@@ -130,21 +215,21 @@ class BinanceClient:
                 startTime=int(start_time.timestamp() * 1000) if start_time else None,
             )
 
-            # Parse klines into readable format
-            result = []
-            for k in klines:
-                result.append(
-                    {
-                        "timestamp": datetime.fromtimestamp(k[0] / 1000),
-                        "open": float(k[1]),
-                        "high": float(k[2]),
-                        "low": float(k[3]),
-                        "close": float(k[4]),
-                        "volume": float(k[5]),
-                    }
-                )
+            # Parse all rows in bulk: column 0 is open time (ms), 1-5 are OHLCV strings
+            rows = np.asarray(klines, dtype=object)
+            if rows.size == 0:
+                rows = np.empty((0, 6), dtype=object)
+
+            ohlcv = rows[:, 1:6].astype(np.float64)
 
-            return result
+            return {
+                "timestamp": rows[:, 0].astype(np.int64),
+                "open": ohlcv[:, 0],
+                "high": ohlcv[:, 1],
+                "low": ohlcv[:, 2],
+                "close": ohlcv[:, 3],
+                "volume": ohlcv[:, 4],
+            }
 
         except BinanceAPIException as e:
             logger.error("binance_klines_error", symbol=symbol, error=str(e))
@@ -159,7 +244,7 @@ class BinanceClient:
             limit: Depth limit (5, 10, 20, 50, 100, 500, 1000)
 
         Returns:
-            Dict with bids and asks
+            Dict with bids and asks as (N, 2) arrays of [price, amount]
         """
         await rate_limiter.acquire("binance", priority="high")
 
@@ -168,15 +253,9 @@ class BinanceClient:
 
             return {
                 "symbol": symbol,
-                "bids": [
-                    {"price": float(b[0]), "amount": float(b[1])}
-                    for b in order_book["bids"]
-                ],
-                "asks": [
-                    {"price": float(a[0]), "amount": float(a[1])}
-                    for a in order_book["asks"]
-                ],
-                "timestamp": datetime.utcnow(),
+                "bids": np.asarray(order_book["bids"], dtype=np.float64).reshape(-1, 2),
+                "asks": np.asarray(order_book["asks"], dtype=np.float64).reshape(-1, 2),
+                "timestamp": time.time(),
             }
 
         except BinanceAPIException as e:
@@ -197,63 +276,102 @@ class BinanceClient:
             await self.connect()
 
         if callback:
-            self.ws_callbacks.append(callback)
+            if inspect.iscoroutinefunction(callback):
+                self.ws_callbacks.append(callback)
+            else:
+                self.ws_sync_callbacks.append(callback)
 
+        # Warm the price cache with one batched REST call before subscribing
         try:
-            # Convert symbols to lowercase for websocket
-            symbol_list = [s.lower() for s in symbols]
+            for ticker in await self.get_tickers_24h(symbols):
+                self.price_cache[ticker.symbol] = ticker
+        except Exception as e:
+            logger.warning("binance_price_cache_warm_error", error=str(e))
 
-            # Start multiplex socket for all symbols
-            socket = self.socket_manager.multiplex_socket(
-                [f"{s}@ticker" for s in symbol_list]
-            )
+        # Convert symbols to lowercase for websocket
+        streams = [f"{s.lower()}@ticker" for s in symbols]
 
-            async with socket as stream:
-                self.ws_connected = True
-                logger.info("binance_websocket_connected", symbols=len(symbols))
+        while not self._shutdown:
+            try:
+                # Start multiplex socket for all symbols
+                socket = self.socket_manager.multiplex_socket(streams)
 
-                while True:
-                    msg = await stream.recv()
+                async with socket as stream:
+                    self.ws_connected = True
+                    logger.info("binance_websocket_connected", symbols=len(symbols))
 
-                    if msg:
-                        await self._process_ticker_message(msg)
+                    while not self._shutdown:
+                        msg = await stream.recv()
+                        self._ws_retry_count = 0
 
-        except Exception as e:
-            logger.error("binance_websocket_error", error=str(e))
+                        if msg:
+                            await self._process_ticker_message(msg)
+
+            except Exception as e:
+                logger.error("binance_websocket_error", error=str(e))
+
+            # Drop socket-fed prices so readers fall back to REST until reconnected
             self.ws_connected = False
+            self.price_cache.clear()
+            if self._shutdown:
+                break
 
-            # Retry connection after delay
-            await asyncio.sleep(5)
-            logger.info("binance_websocket_reconnecting")
-            await self.start_ticker_socket(symbols, callback)
+            # Exponential backoff with jitter so instances don't reconnect in lockstep
+            backoff = min(60, 2**self._ws_retry_count)
+            delay = backoff + random.uniform(0, backoff / 2)
+            self._ws_retry_count += 1
+
+            logger.info("binance_websocket_reconnecting", delay=round(delay, 2))
+            await asyncio.sleep(delay)
 
     async def _process_ticker_message(self, msg: Dict):
         """Process incoming ticker WebSocket message"""
         try:
-            if msg.get("e") == "24hrTicker":
-                data = msg.get("data", {})
-                symbol = data.get("s")
-
-                if symbol:
-                    # Update cache
-                    self.price_cache[symbol] = {
-                        "symbol": symbol,
-                        "price": float(data.get("c", 0)),
-                        "change_24h": float(data.get("P", 0)),
-                        "volume_24h": float(data.get("v", 0)),
-                        "high_24h": float(data.get("h", 0)),
-                        "low_24h": float(data.get("l", 0)),
-                        "timestamp": datetime.utcnow(),
-                    }
-
-                    # Call registered callbacks
-                    for callback in self.ws_callbacks:
-                        await callback(self.price_cache[symbol])
+            # Multiplex streams wrap the event as {"stream": ..., "data": {...}}
+            data = msg.get("data", msg)
+
+            if data.get("e") == "24hrTicker":
+                symbol, price, change, volume, high, low = _TICKER_GET(data)
+
+                # Update cache
+                entry = Tick(
+                    symbol,
+                    float(price),
+                    float(change),
+                    float(volume),
+                    float(high),
+                    float(low),
+                    time.time(),
+                )
+                self.price_cache[symbol] = entry
+
+                for cb in self.ws_sync_callbacks:
+                    try:
+                        cb(entry)
+                    except Exception as e:
+                        logger.error(
+                            "binance_callback_error",
+                            callback=getattr(cb, "__qualname__", repr(cb)),
+                            error=str(e),
+                        )
+
+                # Call async callbacks concurrently; one failing must not stop the rest
+                if self.ws_callbacks:
+                    results = await asyncio.gather(
+                        *(cb(entry) for cb in self.ws_callbacks), return_exceptions=True
+                    )
+                    for cb, result in zip(self.ws_callbacks, results):
+                        if isinstance(result, Exception):
+                            logger.error(
+                                "binance_callback_error",
+                                callback=getattr(cb, "__qualname__", repr(cb)),
+                                error=str(result),
+                            )
 
         except Exception as e:
             logger.error("binance_message_process_error", error=str(e))
 
-    def get_cached_price(self, symbol: str) -> Optional[Dict]:
+    def get_cached_price(self, symbol: str) -> Optional[Tick]:
         """
         Get cached price from WebSocket updates
 
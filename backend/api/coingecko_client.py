@@ -1,13 +1,47 @@
 import asyncio
+import re
+import sys
+import time
+from collections import OrderedDict
+from heapq import nlargest, nsmallest
+from types import MappingProxyType
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-import aiohttp
+import numpy as np
+import orjson
 import structlog
 
+from api.http_session import close_session, get_session
 from api.rate_limiter import rate_limiter
 
 logger = structlog.get_logger()
 
+# Symbol mapping (CoinGecko uses different IDs)
+_RAW_SYMBOL_TO_ID = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "SOL": "solana",
+    "BNB": "binancecoin",
+    "AVAX": "avalanche-2",
+    "LINK": "chainlink",
+    "MATIC": "matic-network",
+    "DOT": "polkadot",
+    "ADA": "cardano",
+    "XRP": "ripple",
+    "INJ": "injective-protocol",
+    "SEI": "sei-network",
+    "ARB": "arbitrum",
+    "OP": "optimism",
+    "TIA": "celestia",
+    "SUI": "sui",
+}
+
+# Read-only, interned lookups in both directions
+SYMBOL_TO_ID = MappingProxyType(
+    {sys.intern(k): sys.intern(v) for k, v in _RAW_SYMBOL_TO_ID.items()}
+)
+ID_TO_SYMBOL = MappingProxyType({v: k for k, v in SYMBOL_TO_ID.items()})
+
 
 class CoinGeckoClient:
     """
@@ -26,25 +60,19 @@ class CoinGeckoClient:
 
     BASE_URL = "https://api.coingecko.com/api/v3"
 
-    # Symbol mapping (CoinGecko uses different IDs)
-    SYMBOL_TO_ID = {
-        "BTC": "bitcoin",
-        "ETH": "ethereum",
-        "SOL": "solana",
-        "BNB": "binancecoin",
-        "AVAX": "avalanche-2",
-        "LINK": "chainlink",
-        "MATIC": "matic-network",
-        "DOT": "polkadot",
-        "ADA": "cardano",
-        "XRP": "ripple",
-        "INJ": "injective-protocol",
-        "SEI": "sei-network",
-        "ARB": "arbitrum",
-        "OP": "optimism",
-        "TIA": "celestia",
-        "SUI": "sui",
-    }
+    # Symbol mapping (CoinGecko uses different IDs), keys are uppercase
+    SYMBOL_TO_ID = SYMBOL_TO_ID
+    ID_TO_SYMBOL = ID_TO_SYMBOL
+
+    # Response cache TTLs (seconds) by endpoint pattern, first match wins
+    CACHE_TTLS = (
+        (re.compile(r"global"), 300),
+        (re.compile(r"coins/markets"), 60),
+        (re.compile(r"search/trending"), 600),
+        (re.compile(r"coins/[^/]+/market_chart"), 3600),
+    )
+    DEFAULT_CACHE_TTL = 60
+    CACHE_MAX_ENTRIES = 256
 
     def __init__(self, api_key: Optional[str] = None):
         """
@@ -54,23 +82,14 @@ class CoinGeckoClient:
             api_key: Optional API key (Pro tier)
         """
         self.api_key = api_key
-        self.session: Optional[aiohttp.ClientSession] = None
-
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None or self.session.closed:
-            headers = {}
-            if self.api_key:
-                headers["X-CG-PRO-API-KEY"] = self.api_key
-
-            self.session = aiohttp.ClientSession(headers=headers)
+        self.headers = {"X-CG-PRO-API-KEY": api_key} if api_key else {}
 
-        return self.session
+        # LRU response cache: key -> (fetched_at, data)
+        self._cache: OrderedDict = OrderedDict()
 
     async def close(self):
-        """Close aiohttp session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Close the shared aiohttp session"""
+        await close_session()
 
     async def _make_request(
         self, endpoint: str, params: Optional[Dict] = None, priority: str = "medium"
@@ -86,20 +105,51 @@ class CoinGeckoClient:
         Returns:
             API response data
         """
+        # Serve from cache while fresh - every CoinGecko call is precious
+        cache_key = (endpoint, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(cache_key)
+        if cached and time.monotonic() - cached[0] < self._cache_ttl(endpoint):
+            self._cache.move_to_end(cache_key)
+            return cached[1]
+
+        data = await self._fetch(endpoint, params, priority)
+
+        # Only cache successful responses
+        if data:
+            self._cache[cache_key] = (time.monotonic(), data)
+            self._cache.move_to_end(cache_key)
+            while len(self._cache) > self.CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+        return data
+
+    def _cache_ttl(self, endpoint: str) -> int:
+        """Get cache TTL for an endpoint"""
+        for pattern, ttl in self.CACHE_TTLS:
+            if pattern.fullmatch(endpoint):
+                return ttl
+        return self.DEFAULT_CACHE_TTL
+
+    async def _fetch(
+        self, endpoint: str, params: Optional[Dict] = None, priority: str = "medium"
+    ) -> Dict:
+        """Fetch endpoint from the API, bypassing the cache"""
         # CRITICAL: Acquire rate limit token BEFORE request
         await rate_limiter.acquire("coingecko", priority=priority, tokens=1)
 
-        session = await self._get_session()
+        session = await get_session()
         url = f"{self.BASE_URL}/{endpoint}"
 
         try:
-            async with session.get(url, params=params, timeout=10) as response:
+            async with session.get(
+                url, params=params, headers=self.headers, timeout=10
+            ) as response:
                 if response.status == 429:
                     # Rate limit exceeded
                     logger.error("coingecko_rate_limit_exceeded")
                     retry_after = int(response.headers.get("Retry-After", 60))
                     await asyncio.sleep(retry_after)
-                    return await self._make_request(endpoint, params, priority)
+                    return await self._fetch(endpoint, params, priority)
 
                 elif response.status != 200:
                     logger.error(
@@ -109,7 +159,7 @@ class CoinGeckoClient:
                     )
                     return {}
 
-                return await response.json()
+                return orjson.loads(await response.read())
 
         except asyncio.TimeoutError:
             logger.error("coingecko_timeout", endpoint=endpoint)
@@ -125,13 +175,13 @@ class CoinGeckoClient:
         Get comprehensive coin data
 
         Args:
-            symbol: Coin symbol (BTC, ETH, etc.)
+            symbol: Uppercase coin symbol (BTC, ETH, etc.)
             include_market_data: Include market cap, volume, etc.
 
         Returns:
             Coin data
         """
-        coin_id = self.SYMBOL_TO_ID.get(symbol.upper())
+        coin_id = SYMBOL_TO_ID.get(symbol)
         if not coin_id:
             logger.warning("coingecko_unknown_symbol", symbol=symbol)
             return None
@@ -153,7 +203,7 @@ class CoinGeckoClient:
         market_data = data.get("market_data", {})
 
         return {
-            "symbol": symbol.upper(),
+            "symbol": symbol,
             "name": data.get("name"),
             "market_cap": market_data.get("market_cap", {}).get("usd"),
             "market_cap_rank": market_data.get("market_cap_rank"),
@@ -169,20 +219,26 @@ class CoinGeckoClient:
 
     async def get_historical_prices(
         self, symbol: str, days: int = 30
-    ) -> List[Dict]:
+    ) -> Dict[str, np.ndarray]:
         """
         Get historical price data
 
         Args:
-            symbol: Coin symbol
+            symbol: Uppercase coin symbol
             days: Number of days of history
 
         Returns:
-            List of price data points
+            Dict with "timestamps" (epoch ms, int64) and "prices" (float64)
+            arrays; convert timestamps to datetimes only when rendering
         """
-        coin_id = self.SYMBOL_TO_ID.get(symbol.upper())
+        empty = {
+            "timestamps": np.empty(0, dtype=np.int64),
+            "prices": np.empty(0, dtype=np.float64),
+        }
+
+        coin_id = SYMBOL_TO_ID.get(symbol)
         if not coin_id:
-            return []
+            return empty
 
         data = await self._make_request(
             f"coins/{coin_id}/market_chart",
@@ -190,17 +246,16 @@ class CoinGeckoClient:
             priority="low",  # Historical data is low priority
         )
 
-        if not data or "prices" not in data:
-            return []
+        if not data or not data.get("prices"):
+            return empty
 
-        # Convert to readable format
-        prices = []
-        for timestamp, price in data["prices"]:
-            prices.append(
-                {"timestamp": datetime.fromtimestamp(timestamp / 1000), "price": price}
-            )
+        # [[timestamp_ms, price], ...] -> two columns in one bulk conversion
+        points = np.asarray(data["prices"], dtype=np.float64)
 
-        return prices
+        return {
+            "timestamps": points[:, 0].astype(np.int64),
+            "prices": points[:, 1],
+        }
 
     async def get_global_market_data(self) -> Dict:
         """
@@ -280,14 +335,12 @@ class CoinGeckoClient:
         if not data:
             return {"gainers": [], "losers": []}
 
-        # Sort by 24h change
-        gainers = sorted(
-            data, key=lambda x: x.get("price_change_percentage_24h", 0), reverse=True
-        )[:limit]
+        # Partial sort by 24h change (the field is null for some coins)
+        def change(x):
+            return x.get("price_change_percentage_24h") or 0.0
 
-        losers = sorted(data, key=lambda x: x.get("price_change_percentage_24h", 0))[
-            :limit
-        ]
+        gainers = nlargest(limit, data, key=change)
+        losers = nsmallest(limit, data, key=change)
 
         return {
             "gainers": [
@@ -322,34 +375,35 @@ class CoinGeckoClient:
         # Fear & Greed is not from CoinGecko
         # Using alternative.me API instead
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://api.alternative.me/fng/", timeout=5
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data and "data" in data:
-                            fng = data["data"][0]
-                            return {
-                                "value": int(fng.get("value")),
-                                "classification": fng.get("value_classification"),
-                                "timestamp": datetime.fromtimestamp(
-                                    int(fng.get("timestamp"))
-                                ),
-                            }
+            session = await get_session()
+            async with session.get(
+                "https://api.alternative.me/fng/", timeout=5
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data and "data" in data:
+                        fng = data["data"][0]
+                        return {
+                            "value": int(fng.get("value")),
+                            "classification": fng.get("value_classification"),
+                            "timestamp": datetime.fromtimestamp(
+                                int(fng.get("timestamp"))
+                            ),
+                        }
         except Exception as e:
             logger.warning("fear_greed_index_error", error=str(e))
 
         return None
 
-    def get_coin_id(self, symbol: str) -> Optional[str]:
+    @staticmethod
+    def get_coin_id(symbol: str) -> Optional[str]:
         """
         Get CoinGecko coin ID from symbol
 
         Args:
-            symbol: Coin symbol
+            symbol: Uppercase coin symbol
 
         Returns:
             CoinGecko coin ID
         """
-        return self.SYMBOL_TO_ID.get(symbol.upper())
+        return SYMBOL_TO_ID.get(symbol)
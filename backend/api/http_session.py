@@ -0,0 +1,59 @@
+import asyncio
+from typing import Iterable, Optional
+import aiohttp
+import structlog
+
+logger = structlog.get_logger()
+
+# Shared aiohttp session for all outbound HTTP (CoinGecko, alternative.me, ...)
+_session: Optional[aiohttp.ClientSession] = None
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use
+
+    One connection pool for the whole process keeps TCP connections and
+    TLS sessions warm across clients and hosts. Must be called from inside
+    the running event loop.
+    """
+    global _session
+
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=50,
+            limit_per_host=10,
+            ttl_dns_cache=300,
+            keepalive_timeout=60,
+        )
+        _session = aiohttp.ClientSession(connector=connector)
+
+    return _session
+
+
+async def close_session():
+    """Close the shared aiohttp session"""
+    global _session
+
+    if _session and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def warm_up(urls: Iterable[str]):
+    """
+    Pre-resolve DNS and open pooled connections to the given hosts
+
+    Args:
+        urls: URLs to send a HEAD request to (failures are ignored)
+    """
+    session = await get_session()
+
+    async def head(url: str):
+        try:
+            async with session.head(url, timeout=5):
+                pass
+        except Exception as e:
+            logger.warning("http_warm_up_error", url=url, error=str(e))
+
+    await asyncio.gather(*(head(url) for url in urls))
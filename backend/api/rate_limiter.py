@@ -1,11 +1,37 @@
 import asyncio
 import time
+from dataclasses import asdict, dataclass
 from typing import Dict, Optional
-from collections import deque
 import structlog
 
 logger = structlog.get_logger()
 
+# GCRA shared through Redis so every worker process draws from one bucket.
+# The key holds the time the bucket is full again (TokenBucket's
+# next_ticket_ns plus its burst), in seconds; Redis server time
+# keeps workers on one clock. Returns the seconds the caller must wait.
+# ARGV: seconds per token, burst window (capacity * interval), request cost
+_GCRA_LUA = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local full_at = math.max(tonumber(redis.call('GET', KEYS[1]) or 0), now) + cost
+local ttl_ms = math.ceil((full_at - now) * 1000) + 1000
+redis.call('SET', KEYS[1], string.format('%.6f', full_at), 'PX', ttl_ms)
+return string.format('%.6f', full_at - now - burst)
+"""
+
+
+@dataclass(slots=True)
+class Stats:
+    """Per-source request counters"""
+
+    total_requests: int = 0
+    successful_requests: int = 0
+    total_wait_time: float = 0.0
+
 
 class TokenBucket:
     """
@@ -15,8 +41,16 @@ class TokenBucket:
     - Refills at a constant rate
     - Allows burst capacity
     - Blocks when tokens depleted
+
+    Instead of a token count it tracks `next_ticket_ns`, the monotonic time
+    (integer nanoseconds, so it never drifts) at which the next token beyond
+    the burst allowance is issued; acquiring is a single compare-and-add.
+    No lock is needed: nothing awaits between reading and advancing
+    `next_ticket_ns`, so the update is atomic within the event loop.
     """
 
+    __slots__ = ("capacity", "refill_rate", "interval_ns", "burst_ns", "next_ticket_ns")
+
     def __init__(self, capacity: int, refill_rate: float):
         """
         Initialize token bucket
@@ -27,9 +61,9 @@ class TokenBucket:
         """
         self.capacity = capacity
         self.refill_rate = refill_rate
-        self.tokens = capacity
-        self.last_refill = time.time()
-        self._lock = asyncio.Lock()
+        self.interval_ns = int(1e9 / refill_rate)  # Nanoseconds per token
+        self.burst_ns = capacity * self.interval_ns
+        self.next_ticket_ns = time.monotonic_ns() - self.burst_ns  # Start full
 
     async def acquire(self, tokens: int = 1) -> bool:
         """
@@ -41,69 +75,29 @@ class TokenBucket:
         Returns:
             bool: True if acquired successfully
         """
-        async with self._lock:
-            await self._refill()
-
-            if self.tokens >= tokens:
-                self.tokens -= tokens
-                return True
-
-            # Calculate wait time if no tokens available
-            wait_time = (tokens - self.tokens) / self.refill_rate
-            logger.info(
-                "rate_limit_wait",
-                tokens_needed=tokens,
-                tokens_available=self.tokens,
-                wait_seconds=wait_time,
-            )
-
+        now = time.monotonic_ns()
+        self.next_ticket_ns = (
+            max(self.next_ticket_ns, now - self.burst_ns) + tokens * self.interval_ns
+        )
+
+        # Wait until the debt beyond burst capacity has been refilled
+        delay_ns = self.next_ticket_ns - now
+        if delay_ns > 0:
+            wait_time = delay_ns / 1e9
+            if wait_time > 1.0:  # Only long stalls are worth a log line
+                logger.info(
+                    "rate_limit_wait",
+                    tokens_needed=tokens,
+                    wait_seconds=wait_time,
+                )
             await asyncio.sleep(wait_time)
-            await self._refill()
-            self.tokens -= tokens
-            return True
-
-    async def _refill(self):
-        """Refill tokens based on elapsed time"""
-        now = time.time()
-        elapsed = now - self.last_refill
 
-        # Add tokens based on elapsed time
-        tokens_to_add = elapsed * self.refill_rate
-        self.tokens = min(self.capacity, self.tokens + tokens_to_add)
-        self.last_refill = now
+        return True
 
     def get_available_tokens(self) -> float:
         """Get current number of available tokens"""
-        return self.tokens
-
-
-class PriorityQueue:
-    """Priority queue for API requests"""
-
-    def __init__(self):
-        self.queues = {
-            "critical": deque(),  # Live price updates
-            "high": deque(),  # User-initiated requests
-            "medium": deque(),  # Background updates
-            "low": deque(),  # Historical data, analytics
-        }
-
-    def add(self, priority: str, request):
-        """Add request to priority queue"""
-        if priority not in self.queues:
-            priority = "medium"
-        self.queues[priority].append(request)
-
-    def get_next(self):
-        """Get next request based on priority"""
-        for priority in ["critical", "high", "medium", "low"]:
-            if self.queues[priority]:
-                return self.queues[priority].popleft()
-        return None
-
-    def size(self) -> int:
-        """Get total queue size"""
-        return sum(len(q) for q in self.queues.values())
+        pending_ns = self.next_ticket_ns + self.burst_ns - time.monotonic_ns()
+        return max(0.0, self.capacity - max(0, pending_ns) / self.interval_ns)
 
 
 class RateLimiter:
@@ -114,12 +108,24 @@ class RateLimiter:
     - CoinGecko: 50 calls/minute (CRITICAL!)
     - Binance: 1200 calls/minute
     - Glassnode: 100 calls/day
+
+    Buckets live in-process until use_redis() is called, after which they
+    are shared by all workers through Redis. If a Redis call fails, the
+    local buckets are used for REDIS_RETRY_COOLDOWN seconds, then Redis
+    is tried again.
     """
 
+    __slots__ = ("limiters", "stats", "_redis", "_gcra", "_redis_retry_at")
+
+    # Seconds to stay on the local buckets after a failed Redis call
+    REDIS_RETRY_COOLDOWN = 5.0
+
     def __init__(self):
         self.limiters: Dict[str, TokenBucket] = {}
-        self.request_queues: Dict[str, PriorityQueue] = {}
-        self.stats: Dict[str, Dict] = {}
+        self.stats: Dict[str, Stats] = {}
+        self._redis = None  # Client shared buckets live in, once attached
+        self._gcra = None  # Registered Lua script once Redis is attached
+        self._redis_retry_at = 0.0  # Monotonic time Redis may be used again
 
         # Initialize limiters
         self._init_limiters()
@@ -141,18 +147,81 @@ class RateLimiter:
         # CryptoQuant: Assume 300 calls/day
         self.limiters["cryptoquant"] = TokenBucket(capacity=300, refill_rate=0.00347)
 
-        # Initialize queues and stats
+        # Initialize stats
         for source in self.limiters.keys():
-            self.request_queues[source] = PriorityQueue()
-            self.stats[source] = {
-                "total_requests": 0,
-                "successful_requests": 0,
-                "failed_requests": 0,
-                "total_wait_time": 0,
-            }
+            self.stats[source] = Stats()
 
         logger.info("rate_limiters_initialized", sources=list(self.limiters.keys()))
 
+    def use_redis(self, redis_client):
+        """
+        Share bucket state across processes through Redis
+
+        Args:
+            redis_client: Connected redis.asyncio client
+        """
+        self._redis = redis_client
+        self._gcra = redis_client.register_script(_GCRA_LUA)
+        logger.info("rate_limiter_redis_enabled")
+
+    def _redis_active(self) -> bool:
+        """Whether the shared Redis buckets are in use right now"""
+        return self._gcra is not None and time.monotonic() >= self._redis_retry_at
+
+    async def _shared_pending(self) -> Optional[Dict[str, float]]:
+        """
+        Seconds of debt on each shared Redis bucket (0 when full)
+
+        Returns:
+            Pending seconds per source, or None if Redis isn't usable
+        """
+        sources = list(self.limiters)
+
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.time()
+            pipe.mget([f"ratelimit:{source}" for source in sources])
+            (seconds, micros), values = await pipe.execute()
+        except Exception as e:
+            logger.warning("rate_limiter_redis_status_failed", error=str(e))
+            return None
+
+        now = seconds + micros / 1e6
+        return {
+            source: max(0.0, float(value) - now) if value is not None else 0.0
+            for source, value in zip(sources, values)
+        }
+
+    async def _acquire_shared(self, source: str, tokens: int) -> bool:
+        """Acquire tokens from the Redis bucket, falling back to the local one"""
+        limiter = self.limiters[source]
+
+        try:
+            wait_time = float(
+                await self._gcra(
+                    keys=[f"ratelimit:{source}"],
+                    args=[
+                        limiter.interval_ns / 1e9,
+                        limiter.burst_ns / 1e9,
+                        tokens * limiter.interval_ns / 1e9,
+                    ],
+                )
+            )
+        except Exception as e:
+            logger.warning(
+                "rate_limiter_redis_failed",
+                error=str(e),
+                fallback="local_buckets",
+                retry_in=self.REDIS_RETRY_COOLDOWN,
+            )
+            self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_COOLDOWN
+            return await limiter.acquire(tokens)
+
+        if wait_time > 0:
+            await asyncio.sleep(wait_time)
+
+        return True
+
     async def acquire(
         self, source: str, priority: str = "medium", tokens: int = 1
     ) -> bool:
@@ -171,22 +240,23 @@ class RateLimiter:
             logger.warning("rate_limiter_unknown_source", source=source)
             return True  # Allow if source not configured
 
-        start_time = time.time()
+        start_time = time.monotonic()
 
-        # Acquire token from bucket
-        success = await self.limiters[source].acquire(tokens)
+        # Acquire token from bucket (both paths always succeed)
+        if self._redis_active():
+            success = await self._acquire_shared(source, tokens)
+        else:
+            success = await self.limiters[source].acquire(tokens)
 
-        wait_time = time.time() - start_time
+        wait_time = time.monotonic() - start_time
 
         # Update stats
-        self.stats[source]["total_requests"] += 1
-        if success:
-            self.stats[source]["successful_requests"] += 1
-        else:
-            self.stats[source]["failed_requests"] += 1
-        self.stats[source]["total_wait_time"] += wait_time
+        stats = self.stats[source]
+        stats.total_requests += 1
+        stats.successful_requests += 1
+        stats.total_wait_time += wait_time
 
-        if wait_time > 0.1:  # Log significant waits
+        if wait_time > 1.0:  # Log significant waits
             logger.info(
                 "rate_limit_acquired",
                 source=source,
@@ -197,13 +267,24 @@ class RateLimiter:
 
         return success
 
-    def get_status(self) -> Dict[str, Dict]:
-        """Get current rate limiter status"""
+    async def get_status(self) -> Dict[str, Dict]:
+        """
+        Get current rate limiter status
+
+        While the Redis buckets are active, availability is read from them
+        (the local buckets aren't consumed then); otherwise it comes from
+        the local buckets. "backend" says which.
+        """
+        shared = await self._shared_pending() if self._redis_active() else None
         status = {}
 
         for source, limiter in self.limiters.items():
-            available_tokens = limiter.get_available_tokens()
             capacity = limiter.capacity
+            if shared is not None:
+                used_tokens = shared[source] * 1e9 / limiter.interval_ns
+                available_tokens = max(0.0, capacity - used_tokens)
+            else:
+                available_tokens = limiter.get_available_tokens()
             usage_pct = ((capacity - available_tokens) / capacity) * 100
 
             status[source] = {
@@ -211,7 +292,8 @@ class RateLimiter:
                 "capacity": capacity,
                 "usage_percent": round(usage_pct, 2),
                 "refill_rate": limiter.refill_rate,
-                "stats": self.stats[source],
+                "backend": "redis" if shared is not None else "local",
+                "stats": asdict(self.stats[source]),
             }
 
         return status
@@ -220,12 +302,7 @@ class RateLimiter:
         """Reset statistics"""
         if source:
             if source in self.stats:
-                self.stats[source] = {
-                    "total_requests": 0,
-                    "successful_requests": 0,
-                    "failed_requests": 0,
-                    "total_wait_time": 0,
-                }
+                self.stats[source] = Stats()
         else:
             for source in self.stats:
                 self.reset_stats(source)
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from functools import cached_property
+from typing import FrozenSet, List
 import os
 
 
@@ -24,6 +25,7 @@ class Settings(BaseSettings):
     DEBUG: bool = True
     LOG_LEVEL: str = "INFO"
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:5173"]
+    WORKERS: int = 1  # uvicorn worker processes when run as `python main.py`
 
     # Rate Limiting
     COINGECKO_MAX_CALLS_PER_MINUTE: int = 50
@@ -31,7 +33,9 @@ class Settings(BaseSettings):
 
     # AI Settings
     CLAUDE_MODEL: str = "claude-sonnet-4-20250514"
-    CLAUDE_MAX_TOKENS: int = 4096
+    CLAUDE_MAX_TOKENS: int = 1024
+    CLAUDE_EXPLAIN_MODEL: str = "claude-3-5-haiku-20241022"
+    MAX_CONCURRENT_ANALYSES: int = 2  # Full Binance + Claude coin analyses in flight
 
     # Trading
     TRACKED_COINS: str = "BTC,ETH,SOL,BNB,AVAX,LINK,MATIC,DOT,ADA,XRP,INJ,SEI,ARB,OP,TIA,SUI"
@@ -42,11 +46,16 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-    @property
+    @cached_property
     def coins_list(self) -> List[str]:
-        """Get list of tracked coins"""
+        """Get list of tracked coins (parsed once)"""
         return [coin.strip() for coin in self.TRACKED_COINS.split(",")]
 
+    @cached_property
+    def coins_set(self) -> FrozenSet[str]:
+        """Tracked coins as a set, for membership checks"""
+        return frozenset(self.coins_list)
+
     @property
     def redis_url(self) -> str:
         """Get Redis connection URL"""
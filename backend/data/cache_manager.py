@@ -1,7 +1,12 @@
-import json
 import asyncio
-from typing import Optional, Any
-from datetime import datetime, timedelta
+import fnmatch
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Optional, Any, Iterable, List, Tuple
+import msgspec
+import numpy as np
 import structlog
 
 try:
@@ -12,6 +17,38 @@ except ImportError:
 logger = structlog.get_logger()
 
 
+def _encode_fallback(obj: Any) -> Any:
+    """Encode numpy values (arrays, non-float scalars) as lists/Python scalars"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Cannot cache value of type {type(obj).__name__}")
+
+
+_encoder = msgspec.msgpack.Encoder(enc_hook=_encode_fallback)
+_decoder = msgspec.msgpack.Decoder()
+
+# Parsed values by (key, digest of the stored bytes): re-reading an unchanged
+# entry skips decoding. Callers share these objects and must not mutate them.
+_DECODE_CACHE_SIZE = 4096
+_decode_cache: OrderedDict[tuple, Any] = OrderedDict()
+
+
+def _decode(key: str, raw: bytes) -> Any:
+    """Decode a Redis value, reusing the parsed object if the bytes are unchanged"""
+    cache_key = (key, hashlib.blake2b(raw, digest_size=8).digest())
+
+    value = _decode_cache.get(cache_key)
+    if value is not None:
+        _decode_cache.move_to_end(cache_key)
+        return value
+
+    value = _decoder.decode(raw)
+    _decode_cache[cache_key] = value
+    if len(_decode_cache) > _DECODE_CACHE_SIZE:
+        _decode_cache.popitem(last=False)
+    return value
+
+
 class CacheManager:
     """
     Multi-level caching system
@@ -25,6 +62,14 @@ class CacheManager:
     - Historical data: 1 hour
     - Market stats: 5 minutes
     - AI analyses: 10 minutes
+
+    Signals are also kept for TTL_SIGNAL_LOCAL seconds in a small
+    per-process LRU in front of Redis, so a dashboard polling /api/signals
+    usually costs no network round trip; Redis stays the source of truth.
+
+    All requests (cache reads/writes and the shared rate limiter) go through
+    one connection pool of up to MAX_CONNECTIONS keep-alive connections,
+    enough for every tracked coin's analysis to hit Redis concurrently.
     """
 
     # Default TTLs (seconds)
@@ -33,25 +78,51 @@ class CacheManager:
     TTL_HISTORICAL = 3600
     TTL_MARKET_STATS = 300
     TTL_AI_ANALYSIS = 600
+    TTL_SIGNAL_ERROR = 30  # Failed analyses; bounds retries against a degraded upstream
+    TTL_SIGNAL_LOCAL = 5  # In-process signal copies; bounds staleness across workers
+
+    # Entries in the in-process signal LRU
+    SIGNAL_LOCAL_MAX = 128
+
+    # Namespace for the msgpack wire format; older JSON values are ignored
+    KEY_PREFIX = "v2:"
+
+    # Keys per SCAN round trip and per UNLINK in clear_pattern
+    SCAN_BATCH = 1000
+
+    # Redis connection pool size
+    MAX_CONNECTIONS = 64
 
-    def __init__(self, redis_url: str = "redis://localhost:6379/0"):
+    def __init__(
+        self, redis_url: str = "redis://localhost:6379/0", fallback_max: int = 10_000
+    ):
         """
         Initialize cache manager
 
         Args:
             redis_url: Redis connection URL
+            fallback_max: Maximum entries in the in-memory fallback (LRU evicted)
         """
         self.redis_url = redis_url
+        self.redis_pool: Optional[redis.ConnectionPool] = None
         self.redis_client: Optional[redis.Redis] = None
-        self.fallback_cache: dict = {}  # In-memory fallback
+        self.fallback_cache: OrderedDict[str, tuple] = OrderedDict()  # In-memory fallback
+        self.fallback_max = fallback_max
+        self.signal_local: OrderedDict[str, tuple] = OrderedDict()  # symbol -> (signal, expires_at)
         self.use_redis = True
 
     async def connect(self):
         """Connect to Redis"""
         try:
-            self.redis_client = redis.from_url(
-                self.redis_url, encoding="utf-8", decode_responses=True
+            # Keep raw bytes: values are msgpack
+            self.redis_pool = redis.ConnectionPool.from_url(
+                self.redis_url,
+                max_connections=self.MAX_CONNECTIONS,
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
             )
+            self.redis_client = redis.Redis(connection_pool=self.redis_pool)
 
             # Test connection
             await self.redis_client.ping()
@@ -65,11 +136,16 @@ class CacheManager:
             )
             self.use_redis = False
             self.redis_client = None
+            if self.redis_pool:
+                await self.redis_pool.disconnect()
+                self.redis_pool = None
 
     async def close(self):
         """Close Redis connection"""
         if self.redis_client:
             await self.redis_client.close()
+        if self.redis_pool:
+            await self.redis_pool.disconnect()
 
     async def get(self, key: str) -> Optional[Any]:
         """
@@ -81,21 +157,16 @@ class CacheManager:
         Returns:
             Cached value or None
         """
+        key = self.KEY_PREFIX + key
+
         try:
             if self.use_redis and self.redis_client:
                 value = await self.redis_client.get(key)
                 if value:
-                    return json.loads(value)
+                    return _decode(key, value)
             else:
                 # Fallback to in-memory cache
-                cached = self.fallback_cache.get(key)
-                if cached:
-                    value, expires_at = cached
-                    if datetime.utcnow() < expires_at:
-                        return value
-                    else:
-                        # Expired
-                        del self.fallback_cache[key]
+                return self._fallback_get(key)
 
             return None
 
@@ -103,6 +174,34 @@ class CacheManager:
             logger.error("cache_get_error", key=key, error=str(e))
             return None
 
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Get several values in one round trip (MGET)
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Cached values (None where missing), in the order of keys
+        """
+        if not keys:
+            return []
+
+        keys = [self.KEY_PREFIX + key for key in keys]
+
+        try:
+            if self.use_redis and self.redis_client:
+                values = await self.redis_client.mget(keys)
+                return [
+                    _decode(key, v) if v else None for key, v in zip(keys, values)
+                ]
+
+            return [self._fallback_get(key) for key in keys]
+
+        except Exception as e:
+            logger.error("cache_get_many_error", keys=len(keys), error=str(e))
+            return [None] * len(keys)
+
     async def set(self, key: str, value: Any, ttl: int = TTL_MARKET_STATS):
         """
         Set value in cache
@@ -112,21 +211,73 @@ class CacheManager:
             value: Value to cache
             ttl: Time to live in seconds
         """
+        key = self.KEY_PREFIX + key
+
         try:
-            serialized = json.dumps(value, default=str)
+            serialized = _encoder.encode(value)
 
             if self.use_redis and self.redis_client:
                 await self.redis_client.setex(key, ttl, serialized)
             else:
                 # Fallback to in-memory cache
-                expires_at = datetime.utcnow() + timedelta(seconds=ttl)
-                self.fallback_cache[key] = (value, expires_at)
+                self._fallback_set(key, value, ttl)
 
         except Exception as e:
             logger.error("cache_set_error", key=key, error=str(e))
 
+    async def set_many(self, items: Iterable[Tuple[str, Any, int]]):
+        """
+        Set several values in one round trip (pipelined SETEX)
+
+        Args:
+            items: (key, value, ttl) tuples
+        """
+        items = [(self.KEY_PREFIX + key, value, ttl) for key, value, ttl in items]
+        if not items:
+            return
+
+        try:
+            if self.use_redis and self.redis_client:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    for key, value, ttl in items:
+                        pipe.setex(key, ttl, _encoder.encode(value))
+                    await pipe.execute()
+            else:
+                for key, value, ttl in items:
+                    self._fallback_set(key, value, ttl)
+
+        except Exception as e:
+            logger.error("cache_set_many_error", keys=len(items), error=str(e))
+
+    def _fallback_get(self, key: str) -> Optional[Any]:
+        """Read a (prefixed) key from the in-memory cache, dropping it if expired"""
+        cached = self.fallback_cache.get(key)
+        if cached:
+            value, expires_at = cached
+            if time.monotonic() < expires_at:
+                self.fallback_cache.move_to_end(key)
+                return value
+            else:
+                # Expired
+                del self.fallback_cache[key]
+
+        return None
+
+    def _fallback_set(self, key: str, value: Any, ttl: int):
+        """Write a (prefixed) key to the in-memory cache, evicting LRU entries"""
+        # Expiry as monotonic seconds: a float compare per lookup
+        expires_at = time.monotonic() + ttl
+        self.fallback_cache[key] = (value, expires_at)
+        self.fallback_cache.move_to_end(key)
+        while len(self.fallback_cache) > self.fallback_max:
+            self.fallback_cache.popitem(last=False)
+
     async def delete(self, key: str):
         """Delete key from cache"""
+        if key.startswith("signal:"):
+            self.signal_local.pop(key[len("signal:"):], None)
+        key = self.KEY_PREFIX + key
+
         try:
             if self.use_redis and self.redis_client:
                 await self.redis_client.delete(key)
@@ -143,26 +294,44 @@ class CacheManager:
         Args:
             pattern: Key pattern (e.g., "coin:*")
         """
+        # Local signal copies are cheap to refetch; drop them all
+        self.signal_local.clear()
+        pattern = self.KEY_PREFIX + pattern
+
         try:
             if self.use_redis and self.redis_client:
                 keys = []
-                async for key in self.redis_client.scan_iter(match=pattern):
+                count = 0
+                async for key in self.redis_client.scan_iter(
+                    match=pattern, count=self.SCAN_BATCH
+                ):
                     keys.append(key)
+                    if len(keys) >= self.SCAN_BATCH:
+                        count += await self._unlink(keys)
+                        keys.clear()
 
                 if keys:
-                    await self.redis_client.delete(*keys)
-                    logger.info("cache_cleared", pattern=pattern, count=len(keys))
+                    count += await self._unlink(keys)
+
+                if count:
+                    logger.info("cache_cleared", pattern=pattern, count=count)
             else:
-                # Clear from fallback cache
-                keys_to_delete = [
-                    k for k in self.fallback_cache.keys() if pattern.replace("*", "") in k
-                ]
+                # Clear from fallback cache, with the same glob rules as SCAN MATCH
+                matches = re.compile(fnmatch.translate(pattern)).match
+                keys_to_delete = [k for k in self.fallback_cache if matches(k)]
                 for key in keys_to_delete:
                     del self.fallback_cache[key]
 
         except Exception as e:
             logger.error("cache_clear_pattern_error", pattern=pattern, error=str(e))
 
+    async def _unlink(self, keys: list) -> int:
+        """Remove keys without blocking Redis (UNLINK), falling back to DEL"""
+        try:
+            return await self.redis_client.unlink(*keys)
+        except redis.ResponseError:
+            return await self.redis_client.delete(*keys)
+
     async def get_stats(self) -> dict:
         """Get cache statistics"""
         try:
@@ -175,16 +344,21 @@ class CacheManager:
                     "keys": await self.redis_client.dbsize(),
                 }
             else:
-                # Fallback cache stats
-                active_keys = sum(
-                    1
-                    for _, expires_at in self.fallback_cache.values()
-                    if datetime.utcnow() < expires_at
-                )
+                # Fallback cache stats; drop expired entries while counting
+                now = time.monotonic()
+                total_keys = len(self.fallback_cache)
+                expired = [
+                    key
+                    for key, (_, expires_at) in self.fallback_cache.items()
+                    if expires_at <= now
+                ]
+                for key in expired:
+                    del self.fallback_cache[key]
+
                 return {
                     "type": "in_memory",
-                    "keys": active_keys,
-                    "total_keys": len(self.fallback_cache),
+                    "keys": len(self.fallback_cache),
+                    "total_keys": total_keys,
                 }
 
         except Exception as e:
@@ -205,6 +379,9 @@ class CacheManager:
     def _make_signal_key(self, symbol: str) -> str:
         return f"signal:{symbol}"
 
+    def _make_signal_error_key(self, symbol: str) -> str:
+        return f"signal:neg:{symbol}"
+
     async def get_price(self, symbol: str) -> Optional[dict]:
         """Get cached price"""
         return await self.get(self._make_price_key(symbol))
@@ -229,14 +406,76 @@ class CacheManager:
         """Cache AI analysis"""
         await self.set(self._make_ai_analysis_key(symbol), analysis_data, self.TTL_AI_ANALYSIS)
 
+    def _signal_local_get(self, symbol: str) -> Optional[dict]:
+        """Read a signal from the in-process LRU, dropping it if expired"""
+        cached = self.signal_local.get(symbol)
+        if cached:
+            value, expires_at = cached
+            if time.monotonic() < expires_at:
+                self.signal_local.move_to_end(symbol)
+                return value
+            del self.signal_local[symbol]
+
+        return None
+
+    def _signal_local_set(self, symbol: str, value: dict):
+        """Write a signal to the in-process LRU, evicting LRU entries"""
+        self.signal_local[symbol] = (value, time.monotonic() + self.TTL_SIGNAL_LOCAL)
+        self.signal_local.move_to_end(symbol)
+        while len(self.signal_local) > self.SIGNAL_LOCAL_MAX:
+            self.signal_local.popitem(last=False)
+
     async def get_signal(self, symbol: str) -> Optional[dict]:
         """Get cached signal"""
-        return await self.get(self._make_signal_key(symbol))
+        signal = self._signal_local_get(symbol)
+        if signal is None:
+            signal = await self.get(self._make_signal_key(symbol))
+            if signal is not None:
+                self._signal_local_set(symbol, signal)
+
+        return signal
 
     async def set_signal(self, symbol: str, signal_data: dict):
         """Cache signal"""
+        self._signal_local_set(symbol, signal_data)
         await self.set(self._make_signal_key(symbol), signal_data, self.TTL_TECHNICAL)
 
+    async def get_signal_error(self, symbol: str) -> Optional[dict]:
+        """Get the cached failure of a recent signal computation"""
+        return await self.get(self._make_signal_error_key(symbol))
+
+    async def set_signal_error(self, symbol: str, error: str):
+        """Remember a failed signal computation for a short while"""
+        await self.set(
+            self._make_signal_error_key(symbol), {"error": error}, self.TTL_SIGNAL_ERROR
+        )
+
+    async def get_signals(self, symbols: List[str]) -> List[Optional[dict]]:
+        """Get cached signals for several symbols in (at most) one round trip"""
+        signals = [self._signal_local_get(s) for s in symbols]
+
+        # One MGET for whatever the in-process LRU didn't have
+        missing = [i for i, signal in enumerate(signals) if signal is None]
+        if missing:
+            fetched = await self.get_many(
+                [self._make_signal_key(symbols[i]) for i in missing]
+            )
+            for i, signal in zip(missing, fetched):
+                if signal is not None:
+                    self._signal_local_set(symbols[i], signal)
+                    signals[i] = signal
+
+        return signals
+
+    async def set_signals(self, signals: dict):
+        """Cache signals for several symbols ({symbol: signal_data}) in one round trip"""
+        for symbol, data in signals.items():
+            self._signal_local_set(symbol, data)
+        await self.set_many(
+            (self._make_signal_key(symbol), data, self.TTL_TECHNICAL)
+            for symbol, data in signals.items()
+        )
+
 
 # Global cache manager instance
 cache_manager = CacheManager()
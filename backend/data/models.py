@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class SignalType(str, Enum):
@@ -25,6 +25,8 @@ class Timeframe(str, Enum):
 
 class TechnicalIndicators(BaseModel):
     """Technical analysis indicators"""
+    model_config = ConfigDict(frozen=True)
+
     rsi: float = Field(..., description="RSI value (0-100)")
     macd: float = Field(..., description="MACD value")
     macd_signal: float = Field(..., description="MACD signal line")
@@ -40,6 +42,8 @@ class TechnicalIndicators(BaseModel):
 
 class OnChainMetrics(BaseModel):
     """On-chain metrics (optional)"""
+    model_config = ConfigDict(frozen=True)
+
     sopr: Optional[float] = Field(None, description="Spent Output Profit Ratio")
     mvrv: Optional[float] = Field(None, description="MVRV Ratio")
     exchange_inflow: Optional[float] = None
@@ -50,6 +54,8 @@ class OnChainMetrics(BaseModel):
 
 class MacroContext(BaseModel):
     """Macroeconomic context"""
+    model_config = ConfigDict(frozen=True)
+
     dxy: Optional[float] = Field(None, description="Dollar Index")
     dxy_trend: Optional[str] = None
     vix: Optional[float] = Field(None, description="Volatility Index")
@@ -60,6 +66,8 @@ class MacroContext(BaseModel):
 
 class CoinPrice(BaseModel):
     """Current coin price data"""
+    model_config = ConfigDict(frozen=True)
+
     symbol: str
     price: float
     change_24h: float
@@ -92,6 +100,8 @@ class AIAnalysis(BaseModel):
 
 class MultiLayerSignal(BaseModel):
     """Aggregated signal from multiple layers"""
+    model_config = ConfigDict(frozen=True)
+
     coin: str
     signal: SignalType
     overall_score: int = Field(..., ge=0, le=100)
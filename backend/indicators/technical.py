@@ -1,10 +1,79 @@
-import pandas as pd
+import bisect
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 import structlog
 
 logger = structlog.get_logger()
 
+# Indicator inputs: float64 arrays pass through np.asarray without a copy
+FloatSeries = Union[np.ndarray, List[float]]
+
+# Technical score contributions per indicator label
+_MACD_DELTA = {"BULLISH": 20, "BEARISH": -20}
+_TREND_DELTA = {"STRONG_UPTREND": 30, "UPTREND": 15, "STRONG_DOWNTREND": -30, "DOWNTREND": -15}
+_BB_DELTA = {"OVERSOLD": 15, "OVERBOUGHT": -15, "SQUEEZE": 5}
+
+# RSI: oversold below 30/40 is bullish, overbought above 60/70 is bearish
+_RSI_LOW_BINS = (30, 40)
+_RSI_HIGH_BINS = (60, 70)
+_RSI_DELTAS = (20, 10, 0, -10, -20)
+
+
+def _ema_last(prices: np.ndarray, span: int) -> float:
+    """Final value of the recursive EMA (pandas ewm(span, adjust=False))"""
+    alpha = 2.0 / (span + 1.0)
+    values = prices.tolist()
+    ema = values[0]
+    for x in values[1:]:
+        ema = alpha * x + (1 - alpha) * ema
+    return ema
+
+
+def _macd_last(prices: np.ndarray, fast: int, slow: int, signal: int) -> tuple:
+    """Final (macd, signal, histogram) from one pass over the prices"""
+    a_fast = 2.0 / (fast + 1.0)
+    a_slow = 2.0 / (slow + 1.0)
+    a_signal = 2.0 / (signal + 1.0)
+
+    values = prices.tolist()
+    ema_fast = ema_slow = values[0]
+    signal_line = 0.0  # MACD starts at 0: both EMAs seed with the first price
+    for x in values[1:]:
+        ema_fast = a_fast * x + (1 - a_fast) * ema_fast
+        ema_slow = a_slow * x + (1 - a_slow) * ema_slow
+        signal_line = a_signal * (ema_fast - ema_slow) + (1 - a_signal) * signal_line
+
+    macd = ema_fast - ema_slow
+    return macd, signal_line, macd - signal_line
+
+
+def _candle_pass(prices: np.ndarray) -> tuple:
+    """
+    Every recursive indicator analyze_candles needs, from one pass
+
+    Same recurrences as _macd_last (12/26/9) and _ema_last (20/50/200),
+    fused so the close series is traversed once instead of four times.
+
+    Returns:
+        (macd, signal, histogram, ema_20, ema_50, ema_200)
+    """
+    a12, a26, a9 = 2.0 / 13.0, 2.0 / 27.0, 2.0 / 10.0
+    a20, a50, a200 = 2.0 / 21.0, 2.0 / 51.0, 2.0 / 201.0
+
+    values = prices.tolist()
+    ema_12 = ema_26 = ema_20 = ema_50 = ema_200 = values[0]
+    signal_line = 0.0
+    for x in values[1:]:
+        ema_12 = a12 * x + (1 - a12) * ema_12
+        ema_26 = a26 * x + (1 - a26) * ema_26
+        signal_line = a9 * (ema_12 - ema_26) + (1 - a9) * signal_line
+        ema_20 = a20 * x + (1 - a20) * ema_20
+        ema_50 = a50 * x + (1 - a50) * ema_50
+        ema_200 = a200 * x + (1 - a200) * ema_200
+
+    macd = ema_12 - ema_26
+    return macd, signal_line, macd - signal_line, ema_20, ema_50, ema_200
+
 
 class TechnicalIndicators:
     """
@@ -19,12 +88,12 @@ class TechnicalIndicators:
     """
 
     @staticmethod
-    def calculate_rsi(prices: List[float], period: int = 14) -> Optional[float]:
+    def calculate_rsi(prices: FloatSeries, period: int = 14) -> Optional[float]:
         """
         Calculate RSI
 
         Args:
-            prices: List of closing prices
+            prices: Closing prices
             period: RSI period (default 14)
 
         Returns:
@@ -35,24 +104,22 @@ class TechnicalIndicators:
             return None
 
         try:
-            df = pd.DataFrame({"close": prices})
-
-            # Calculate price changes
-            delta = df["close"].diff()
+            delta = np.diff(np.asarray(prices, dtype=np.float64))
+            gains = np.where(delta > 0, delta, 0.0)
+            losses = np.where(delta < 0, -delta, 0.0)
 
-            # Separate gains and losses
-            gains = delta.where(delta > 0, 0)
-            losses = -delta.where(delta < 0, 0)
+            # Wilder's smoothing: seed with the simple average of the first
+            # `period` changes, then carry one running average per side
+            avg_gain = float(gains[:period].mean())
+            avg_loss = float(losses[:period].mean())
+            for gain, loss in zip(gains[period:].tolist(), losses[period:].tolist()):
+                avg_gain = (avg_gain * (period - 1) + gain) / period
+                avg_loss = (avg_loss * (period - 1) + loss) / period
 
-            # Calculate average gain and loss
-            avg_gain = gains.rolling(window=period).mean()
-            avg_loss = losses.rolling(window=period).mean()
+            if avg_loss == 0:
+                return 100.0 if avg_gain > 0 else 50.0  # All gains / flat
 
-            # Calculate RS and RSI
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-
-            return float(rsi.iloc[-1])
+            return 100 - (100 / (1 + avg_gain / avg_loss))
 
         except Exception as e:
             logger.error("rsi_calculation_error", error=str(e))
@@ -60,13 +127,13 @@ class TechnicalIndicators:
 
     @staticmethod
     def calculate_macd(
-        prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9
+        prices: FloatSeries, fast: int = 12, slow: int = 26, signal: int = 9
     ) -> Optional[Dict]:
         """
         Calculate MACD
 
         Args:
-            prices: List of closing prices
+            prices: Closing prices
             fast: Fast EMA period (default 12)
             slow: Slow EMA period (default 26)
             signal: Signal line period (default 9)
@@ -79,25 +146,15 @@ class TechnicalIndicators:
             return None
 
         try:
-            df = pd.DataFrame({"close": prices})
-
-            # Calculate EMAs
-            ema_fast = df["close"].ewm(span=fast, adjust=False).mean()
-            ema_slow = df["close"].ewm(span=slow, adjust=False).mean()
-
-            # MACD line
-            macd_line = ema_fast - ema_slow
-
-            # Signal line
-            signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-
-            # Histogram
-            histogram = macd_line - signal_line
+            # Fast/slow EMAs and the signal EMA advance together in one pass
+            macd_line, signal_line, histogram = _macd_last(
+                np.asarray(prices, dtype=np.float64), fast, slow, signal
+            )
 
             return {
-                "macd": float(macd_line.iloc[-1]),
-                "signal": float(signal_line.iloc[-1]),
-                "histogram": float(histogram.iloc[-1]),
+                "macd": macd_line,
+                "signal": signal_line,
+                "histogram": histogram,
             }
 
         except Exception as e:
@@ -106,13 +163,13 @@ class TechnicalIndicators:
 
     @staticmethod
     def calculate_bollinger_bands(
-        prices: List[float], period: int = 20, std_dev: float = 2.0
+        prices: FloatSeries, period: int = 20, std_dev: float = 2.0
     ) -> Optional[Dict]:
         """
         Calculate Bollinger Bands
 
         Args:
-            prices: List of closing prices
+            prices: Closing prices
             period: Moving average period (default 20)
             std_dev: Standard deviation multiplier (default 2)
 
@@ -124,22 +181,22 @@ class TechnicalIndicators:
             return None
 
         try:
-            df = pd.DataFrame({"close": prices})
+            window = np.asarray(prices, dtype=np.float64)[-period:]
 
             # Middle band (SMA)
-            middle_band = df["close"].rolling(window=period).mean()
+            middle_band = float(window.mean())
 
-            # Standard deviation
-            std = df["close"].rolling(window=period).std()
+            # Sample standard deviation, as pandas rolling().std()
+            std = float(window.std(ddof=1))
 
             # Upper and lower bands
             upper_band = middle_band + (std * std_dev)
             lower_band = middle_band - (std * std_dev)
 
             return {
-                "upper": float(upper_band.iloc[-1]),
-                "middle": float(middle_band.iloc[-1]),
-                "lower": float(lower_band.iloc[-1]),
+                "upper": upper_band,
+                "middle": middle_band,
+                "lower": lower_band,
             }
 
         except Exception as e:
@@ -147,12 +204,12 @@ class TechnicalIndicators:
             return None
 
     @staticmethod
-    def calculate_ema(prices: List[float], period: int) -> Optional[float]:
+    def calculate_ema(prices: FloatSeries, period: int) -> Optional[float]:
         """
         Calculate Exponential Moving Average
 
         Args:
-            prices: List of closing prices
+            prices: Closing prices
             period: EMA period
 
         Returns:
@@ -162,9 +219,7 @@ class TechnicalIndicators:
             return None
 
         try:
-            df = pd.DataFrame({"close": prices})
-            ema = df["close"].ewm(span=period, adjust=False).mean()
-            return float(ema.iloc[-1])
+            return _ema_last(np.asarray(prices, dtype=np.float64), period)
 
         except Exception as e:
             logger.error("ema_calculation_error", error=str(e))
@@ -172,13 +227,13 @@ class TechnicalIndicators:
 
     @staticmethod
     def calculate_volume_ratio(
-        volumes: List[float], period: int = 20
+        volumes: FloatSeries, period: int = 20
     ) -> Optional[float]:
         """
         Calculate volume ratio (current vs average)
 
         Args:
-            volumes: List of volume values
+            volumes: Volume values
             period: Period for average calculation
 
         Returns:
@@ -188,13 +243,13 @@ class TechnicalIndicators:
             return None
 
         try:
-            df = pd.DataFrame({"volume": volumes})
+            volumes = np.asarray(volumes, dtype=np.float64)
 
             # Average volume
-            avg_volume = df["volume"].iloc[:-1].tail(period).mean()
+            avg_volume = volumes[-(period + 1):-1].mean()
 
             # Current volume
-            current_volume = df["volume"].iloc[-1]
+            current_volume = volumes[-1]
 
             if avg_volume == 0:
                 return None
@@ -206,42 +261,49 @@ class TechnicalIndicators:
             return None
 
     @staticmethod
-    def analyze_candles(ohlcv_data: List[Dict]) -> Dict:
+    def analyze_candles(ohlcv_data: Dict[str, np.ndarray]) -> Dict:
         """
         Comprehensive analysis of OHLCV data
 
         Args:
-            ohlcv_data: List of OHLCV candles
+            ohlcv_data: OHLCV column arrays (as returned by get_klines)
 
         Returns:
             Dict with all technical indicators
         """
-        if len(ohlcv_data) < 50:
+        closes = np.asarray(ohlcv_data["close"], dtype=np.float64)
+        volumes = ohlcv_data["volume"]
+
+        if len(closes) < 50:
             logger.warning(
                 "insufficient_candles_for_analysis",
                 required=50,
-                got=len(ohlcv_data),
+                got=len(closes),
             )
             return {}
 
         try:
-            # Extract price and volume data
-            closes = [c["close"] for c in ohlcv_data]
-            volumes = [c["volume"] for c in ohlcv_data]
+            # MACD and the trend EMAs in one traversal; >= 50 candles covers
+            # MACD (35) and EMA 20/50, EMA 200 needs its full period
+            macd, macd_signal_line, macd_histogram, ema_20, ema_50, ema_200 = (
+                _candle_pass(closes)
+            )
+            macd_data = {
+                "macd": macd,
+                "signal": macd_signal_line,
+                "histogram": macd_histogram,
+            }
+            if len(closes) < 200:
+                ema_200 = None
 
-            # Calculate indicators
+            # Window-only indicators read just the tail of the series
             rsi = TechnicalIndicators.calculate_rsi(closes)
-            macd_data = TechnicalIndicators.calculate_macd(closes)
             bb_data = TechnicalIndicators.calculate_bollinger_bands(closes)
 
-            ema_20 = TechnicalIndicators.calculate_ema(closes, 20)
-            ema_50 = TechnicalIndicators.calculate_ema(closes, 50)
-            ema_200 = TechnicalIndicators.calculate_ema(closes, 200)
-
             volume_ratio = TechnicalIndicators.calculate_volume_ratio(volumes)
 
             # Current price
-            current_price = closes[-1]
+            current_price = float(closes[-1])
 
             # Determine trend
             trend = "UNKNOWN"
@@ -331,44 +393,18 @@ class TechnicalIndicators:
         """
         score = 50  # Neutral starting point
 
-        # RSI contribution (0-20 points)
-        if indicators.get("rsi"):
-            rsi = indicators["rsi"]
-            if rsi < 30:
-                score += 20  # Very oversold = bullish
-            elif rsi < 40:
-                score += 10
-            elif rsi > 70:
-                score -= 20  # Very overbought = bearish
-            elif rsi > 60:
-                score -= 10
-
-        # MACD contribution (0-20 points)
-        macd_signal = indicators.get("macd_signal", "NEUTRAL")
-        if macd_signal == "BULLISH":
-            score += 20
-        elif macd_signal == "BEARISH":
-            score -= 20
-
-        # Trend contribution (0-30 points)
-        trend = indicators.get("trend", "UNKNOWN")
-        if trend == "STRONG_UPTREND":
-            score += 30
-        elif trend == "UPTREND":
-            score += 15
-        elif trend == "STRONG_DOWNTREND":
-            score -= 30
-        elif trend == "DOWNTREND":
-            score -= 15
-
-        # Bollinger Bands contribution (0-15 points)
-        bb_signal = indicators.get("bb_signal", "NEUTRAL")
-        if bb_signal == "OVERSOLD":
-            score += 15
-        elif bb_signal == "OVERBOUGHT":
-            score -= 15
-        elif bb_signal == "SQUEEZE":
-            score += 5  # Potential breakout
+        # RSI contribution (0-20 points): strict < on low bins, strict > on high
+        rsi = indicators.get("rsi")
+        if rsi:
+            score += _RSI_DELTAS[
+                bisect.bisect_right(_RSI_LOW_BINS, rsi)
+                + bisect.bisect_left(_RSI_HIGH_BINS, rsi)
+            ]
+
+        # MACD (0-20), trend (0-30) and Bollinger Bands (0-15) contributions
+        score += _MACD_DELTA.get(indicators.get("macd_signal", ""), 0)
+        score += _TREND_DELTA.get(indicators.get("trend", ""), 0)
+        score += _BB_DELTA.get(indicators.get("bb_signal", ""), 0)
 
         # Volume contribution (0-15 points)
         volume_ratio = indicators.get("volume_ratio")
@@ -1,17 +1,29 @@
+import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+import orjson
 import structlog
-from typing import List, Optional
+from typing import Dict, List, Optional, Set
 
 from config.settings import settings
 from data.cache_manager import cache_manager
 from api.binance_client import BinanceClient
 from api.coingecko_client import CoinGeckoClient
+from api.http_session import warm_up
+from api.rate_limiter import rate_limiter
 from ai_agent.claude_analyzer import claude_analyzer
 from ai_agent.signal_generator import signal_generator
 from indicators.technical import TechnicalIndicators
-from data.models import CoinAnalysis, MarketOverview, MorningBrief
+from data.models import (
+    CoinAnalysis,
+    CoinPrice,
+    MarketOverview,
+    MorningBrief,
+    TechnicalIndicators as TechModel,
+)
 
 # Configure logging
 structlog.configure(
@@ -24,6 +36,11 @@ structlog.configure(
 logger = structlog.get_logger()
 
 
+def _to_iso(timestamp: float) -> str:
+    """Convert a unix timestamp to an ISO 8601 UTC string for API responses"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
 # Lifespan context manager for startup/shutdown
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,9 +53,16 @@ async def lifespan(app: FastAPI):
 
     app.state.coingecko = CoinGeckoClient(settings.COINGECKO_API_KEY)
 
+    # Resolve DNS and open pooled connections before the first request
+    await warm_up([CoinGeckoClient.BASE_URL, "https://api.alternative.me/fng/"])
+
     # Connect cache
     await cache_manager.connect()
 
+    # Share rate limits across worker processes when Redis is available
+    if cache_manager.redis_client:
+        rate_limiter.use_redis(cache_manager.redis_client)
+
     logger.info("application_started")
 
     yield
@@ -47,6 +71,7 @@ async def lifespan(app: FastAPI):
     logger.info("shutting_down_application")
     await app.state.binance.close()
     await app.state.coingecko.close()
+    await claude_analyzer.aclose()
     await cache_manager.close()
     logger.info("application_stopped")
 
@@ -57,6 +82,7 @@ app = FastAPI(
     description="AI-powered cryptocurrency trading analysis system",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -106,93 +132,173 @@ async def get_coin_analysis(symbol: str):
     """
     symbol = symbol.upper()
 
-    if symbol not in settings.coins_list:
+    if symbol not in settings.coins_set:
         raise HTTPException(status_code=404, detail=f"Coin {symbol} not tracked")
 
     try:
-        # Check cache first
-        cached = await cache_manager.get_signal(symbol)
-        if cached:
-            logger.info("coin_analysis_cache_hit", symbol=symbol)
-            return cached
-
-        # Fetch data from Binance
-        ticker_symbol = f"{symbol}USDT"
-        price_data = await app.state.binance.get_ticker_24h(ticker_symbol)
-
-        # Get historical data for technical analysis
-        klines = await app.state.binance.get_klines(ticker_symbol, interval="1h", limit=200)
-
-        # Calculate technical indicators
-        tech_analysis = TechnicalIndicators.analyze_candles(klines)
-
-        # Build TechnicalIndicators model
-        from data.models import TechnicalIndicators as TechModel
-        technical = TechModel(
-            rsi=tech_analysis["rsi"],
-            macd=tech_analysis["macd"],
-            macd_signal=tech_analysis["macd_signal_line"],
-            macd_histogram=tech_analysis["macd_histogram"],
-            bb_upper=tech_analysis["bb_upper"],
-            bb_middle=tech_analysis["bb_middle"],
-            bb_lower=tech_analysis["bb_lower"],
-            ema_20=tech_analysis.get("ema_20"),
-            ema_50=tech_analysis.get("ema_50"),
-            ema_200=tech_analysis.get("ema_200"),
-            volume_ratio=tech_analysis.get("volume_ratio"),
-        )
+        return await _compute_or_get_coin_analysis(symbol)
 
-        # Build CoinPrice model
-        from data.models import CoinPrice
-        coin_price = CoinPrice(**price_data)
+    except HTTPException:
+        raise
 
-        # Get AI analysis from Claude
-        ai_analysis = await claude_analyzer.analyze_coin(
-            coin=symbol,
-            price_data=coin_price,
-            technical=technical,
-            macro=None,  # TODO: Add macro context
-        )
+    except Exception as e:
+        logger.error("coin_analysis_error", symbol=symbol, error=str(e))
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
+# Coin analyses currently being computed, by symbol
+_inflight_analyses: Dict[str, asyncio.Task] = {}
 
-        # Generate multi-layer signal
-        signal = signal_generator.generate_signal(
-            coin=symbol,
-            price_data=coin_price,
-            technical=technical,
-            ai_analysis=ai_analysis,
-            macro=None,
+# Bounds concurrent analyses across all requests, so fan-outs (the morning
+# brief, several cold coins at once) queue here instead of tripping 429s
+_analysis_slots = asyncio.Semaphore(settings.MAX_CONCURRENT_ANALYSES)
+
+# Fire-and-forget cache writes; referenced here so they aren't garbage collected
+_background_tasks: Set[asyncio.Task] = set()
+
+
+async def _compute_or_get_coin_analysis(symbol: str) -> dict:
+    """
+    Cached analysis for a tracked coin, computing and caching it on a miss
+
+    A failed computation is remembered for TTL_SIGNAL_ERROR seconds; until
+    then requests get a 503 instead of rerunning Binance and Claude.
+
+    Args:
+        symbol: Uppercase coin symbol
+
+    Returns:
+        Dict with coin, price, technical, ai_analysis and signal
+    """
+    # Check cache first
+    cached = await cache_manager.get_signal(symbol)
+    if cached:
+        logger.info("coin_analysis_cache_hit", symbol=symbol)
+        return cached
+
+    failed = await cache_manager.get_signal_error(symbol)
+    if failed:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Analysis recently failed, retry later: {failed['error']}",
         )
 
-        result = {
-            "coin": symbol,
-            "price": price_data,
-            "technical": tech_analysis,
-            "ai_analysis": ai_analysis.dict(),
-            "signal": signal.dict(),
-        }
+    # Concurrent misses for one coin share a single computation. Shielded so
+    # a client disconnecting doesn't cancel it for the others.
+    task = _inflight_analyses.get(symbol)
+    if task is None:
+        task = asyncio.create_task(_analyze_and_cache(symbol))
+        _inflight_analyses[symbol] = task
+        task.add_done_callback(lambda _: _inflight_analyses.pop(symbol, None))
+    else:
+        logger.info("coin_analysis_coalesced", symbol=symbol)
 
-        # Cache result
-        await cache_manager.set_signal(symbol, result)
+    return await asyncio.shield(task)
 
-        return result
 
+async def _analyze_and_cache(symbol: str) -> dict:
+    """Compute a coin analysis and cache the result (or the failure)"""
+    try:
+        async with _analysis_slots:
+            result = await _compute_coin_analysis(symbol)
     except Exception as e:
-        logger.error("coin_analysis_error", symbol=symbol, error=str(e))
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        await cache_manager.set_signal_error(symbol, str(e))
+        raise
+
+    # Cache result off the response path. The write task starts before this
+    # task's done callbacks run, so the in-process signal cache is filled
+    # before the symbol leaves _inflight_analyses.
+    task = asyncio.create_task(cache_manager.set_signal(symbol, result))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    return result
+
+
+async def _compute_coin_analysis(symbol: str) -> dict:
+    """Run the full Binance + indicators + Claude pipeline for one coin"""
+
+    # Fetch the live ticker and the candles for technical analysis together
+    ticker_symbol = f"{symbol}USDT"
+    price_data, klines = await asyncio.gather(
+        app.state.binance.get_ticker_24h(ticker_symbol),
+        app.state.binance.get_klines(ticker_symbol, interval="1h", limit=200),
+    )
+
+    # Calculate technical indicators
+    tech_analysis = TechnicalIndicators.analyze_candles(klines)
+
+    # Build TechnicalIndicators model
+    # Indicator values are computed in-process; skip re-validation
+    technical = TechModel.model_construct(
+        rsi=tech_analysis["rsi"],
+        macd=tech_analysis["macd"],
+        macd_signal=tech_analysis["macd_signal_line"],
+        macd_histogram=tech_analysis["macd_histogram"],
+        bb_upper=tech_analysis["bb_upper"],
+        bb_middle=tech_analysis["bb_middle"],
+        bb_lower=tech_analysis["bb_lower"],
+        ema_20=tech_analysis.get("ema_20"),
+        ema_50=tech_analysis.get("ema_50"),
+        ema_200=tech_analysis.get("ema_200"),
+        volume_ratio=tech_analysis.get("volume_ratio"),
+    )
+
+    # Build CoinPrice model
+    coin_price = CoinPrice.model_construct(
+        **price_data._replace(
+            timestamp=datetime.fromtimestamp(price_data.timestamp, tz=timezone.utc)
+        )._asdict()
+    )
+
+    # Get AI analysis from Claude
+    ai_analysis = await claude_analyzer.analyze_coin(
+        coin=symbol,
+        price_data=coin_price,
+        technical=technical,
+        macro=None,  # TODO: Add macro context
+    )
+
+    # Generate multi-layer signal
+    signal = signal_generator.generate_signal(
+        coin=symbol,
+        price_data=coin_price,
+        technical=technical,
+        ai_analysis=ai_analysis,
+        macro=None,
+    )
+
+    return {
+        "coin": symbol,
+        "price": {**price_data._asdict(), "timestamp": _to_iso(price_data.timestamp)},
+        "technical": tech_analysis,
+        "ai_analysis": ai_analysis.model_dump(mode="json"),
+        "signal": signal.model_dump(mode="json"),
+    }
 
 
 @app.get("/api/market-overview")
 async def get_market_overview():
     """Get overall market overview"""
     try:
-        # Get global market data from CoinGecko
-        global_data = await app.state.coingecko.get_global_market_data()
-
-        # Get top gainers and losers
-        movers = await app.state.coingecko.get_top_gainers_losers(limit=5)
+        # Global market data, top movers and fear & greed are independent
+        global_data, movers, fear_greed = await asyncio.gather(
+            app.state.coingecko.get_global_market_data(),
+            app.state.coingecko.get_top_gainers_losers(limit=5),
+            app.state.coingecko.get_fear_greed_index(),
+            return_exceptions=True,
+        )
 
-        # Get fear & greed index
-        fear_greed = await app.state.coingecko.get_fear_greed_index()
+        # One source being down shouldn't fail the whole overview
+        if isinstance(global_data, Exception):
+            logger.warning("market_overview_source_error", source="global", error=str(global_data))
+            global_data = {}
+        if isinstance(movers, Exception):
+            logger.warning("market_overview_source_error", source="movers", error=str(movers))
+            movers = {"gainers": [], "losers": []}
+        if isinstance(fear_greed, Exception):
+            logger.warning("market_overview_source_error", source="fear_greed", error=str(fear_greed))
+            fear_greed = None
 
         return {
             "total_market_cap": global_data.get("total_market_cap_usd"),
@@ -208,63 +314,79 @@ async def get_market_overview():
         raise HTTPException(status_code=500, detail=f"Market overview failed: {str(e)}")
 
 
-@app.get("/api/signals")
-async def get_all_signals():
-    """Get trading signals for all tracked coins"""
-    results = []
+async def _iter_signal_summaries():
+    """Yield the summary of each tracked coin with a cached signal, in order"""
+    # One MGET for every tracked coin instead of a round trip each
+    symbols = settings.coins_list
+    signals = await cache_manager.get_signals(symbols)
 
-    for symbol in settings.coins_list:
+    for symbol, cached in zip(symbols, signals):
         try:
-            # Try cache first
-            cached = await cache_manager.get_signal(symbol)
             if cached:
-                results.append({
+                sig, pr = cached["signal"], cached["price"]
+                yield {
                     "symbol": symbol,
-                    "signal": cached["signal"]["signal"],
-                    "confidence": cached["signal"]["confidence"],
-                    "price": cached["price"]["price"],
-                    "change_24h": cached["price"]["change_24h"],
-                })
+                    "signal": sig["signal"],
+                    "confidence": sig["confidence"],
+                    "price": pr["price"],
+                    "change_24h": pr["change_24h"],
+                }
         except Exception as e:
             logger.warning("signal_fetch_error", symbol=symbol, error=str(e))
             continue
 
-    return {"signals": results}
+
+@app.get("/api/signals")
+async def get_all_signals():
+    """Get trading signals for all tracked coins"""
+    return {"signals": [summary async for summary in _iter_signal_summaries()]}
+
+
+@app.get("/api/signals/stream")
+async def stream_all_signals():
+    """Stream trading signals for all tracked coins as NDJSON, one coin per line"""
+
+    async def lines():
+        async for summary in _iter_signal_summaries():
+            yield orjson.dumps(summary) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# Coins featured in the morning brief
+_BRIEF_COINS = ["BTC", "ETH", "SOL"]
 
 
 @app.get("/api/morning-brief")
 async def get_morning_brief():
     """Get AI-generated morning brief"""
     try:
-        # Get market overview
-        market = await get_market_overview()
+        # Cached signals first (one MGET); only misses run a full analysis,
+        # concurrently with the market overview
+        cached = await cache_manager.get_signals(_BRIEF_COINS)
+        missing = [coin for coin, analysis in zip(_BRIEF_COINS, cached) if not analysis]
+
+        market, *computed = await asyncio.gather(
+            get_market_overview(),
+            *(_compute_or_get_coin_analysis(coin) for coin in missing),
+        )
+        fresh = dict(zip(missing, computed))
 
-        # Get signals for top coins
-        btc_analysis = await get_coin_analysis("BTC")
-        eth_analysis = await get_coin_analysis("ETH")
-        sol_analysis = await get_coin_analysis("SOL")
+        top_opportunities = []
+        for coin, analysis in zip(_BRIEF_COINS, cached):
+            sig = (analysis or fresh[coin])["signal"]
+            top_opportunities.append(
+                {"coin": coin, "signal": sig["signal"], "confidence": sig["confidence"]}
+            )
+
+        # The overview reports None when CoinGecko's global data is unavailable
+        cap_change = market["market_cap_change_24h"] or 0
 
         # Build morning brief
         return {
             "date": str(datetime.now().date()),
-            "market_status": "BULLISH" if market.get("market_cap_change_24h", 0) > 0 else "BEARISH",
-            "top_opportunities": [
-                {
-                    "coin": btc_analysis["coin"],
-                    "signal": btc_analysis["signal"]["signal"],
-                    "confidence": btc_analysis["signal"]["confidence"],
-                },
-                {
-                    "coin": eth_analysis["coin"],
-                    "signal": eth_analysis["signal"]["signal"],
-                    "confidence": eth_analysis["signal"]["confidence"],
-                },
-                {
-                    "coin": sol_analysis["coin"],
-                    "signal": sol_analysis["signal"]["signal"],
-                    "confidence": sol_analysis["signal"]["confidence"],
-                },
-            ],
+            "market_status": "BULLISH" if cap_change > 0 else "BEARISH",
+            "top_opportunities": top_opportunities,
             "macro_alerts": [],
             "risk_level": "MEDIUM",
             "fear_greed": market.get("fear_greed_index"),
@@ -278,12 +400,19 @@ async def get_morning_brief():
 @app.get("/api/rate-limits")
 async def get_rate_limits():
     """Get current rate limit status"""
-    from api.rate_limiter import rate_limiter
-
-    return rate_limiter.get_status()
+    return await rate_limiter.get_status()
 
 
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop and httptools ship with uvicorn[standard]. Multiple workers need
+    # the app as an import string; the rate limiter is shared through Redis.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=settings.WORKERS,
+    )
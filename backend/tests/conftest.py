@@ -0,0 +1,9 @@
+import os
+import sys
+from pathlib import Path
+
+# Backend modules import each other as top-level packages (config, data, ...)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings require an API key at import time; tests never call Claude
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
@@ -0,0 +1,225 @@
+import asyncio
+import random
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from ai_agent.claude_analyzer import (
+    ClaudeAnalyzer,
+    IncrementalJsonParser,
+    _parse_json_response,
+)
+from data.models import CoinPrice, SignalType, TechnicalIndicators
+
+_ANALYSIS = {
+    "rating": "BUY",
+    "confidence": 72,
+    "timeframe": "SWING",
+    "stop_loss": None,
+    "reasoning": 'Braces {like} these, "quotes" and commas, inside strings',
+    "key_factors": ["Higher lows", "Volume [rising], steadily"],
+    "levels": {"support": [1.5, {"strong": True}]},
+}
+
+
+def _feed_in_chunks(text, rng):
+    parser = IncrementalJsonParser()
+    i = 0
+    while i < len(text):
+        size = rng.randint(1, 8)
+        parser.feed(text[i:i + size])
+        i += size
+    return parser
+
+
+@pytest.mark.parametrize(
+    "prefix",
+    ["", "```json\n", "Sure {note}: ", "Empty {} first "],
+)
+def test_parser_chunked(prefix):
+    text = prefix + orjson.dumps(_ANALYSIS, option=orjson.OPT_INDENT_2).decode() + "\n```"
+    rng = random.Random(prefix)
+
+    for _ in range(200):
+        parser = _feed_in_chunks(text, rng)
+        assert parser.complete
+        assert parser.errors == []
+        assert parser.fields == _ANALYSIS
+
+    # The full-text fallback finds the same object
+    assert dict(_parse_json_response(text)) == _ANALYSIS
+
+
+def test_parser_incomplete_stream():
+    parser = IncrementalJsonParser()
+    parser.feed('{"rating": "BUY", "confidence": 7')
+
+    assert not parser.complete
+    assert parser.fields == {"rating": "BUY"}
+
+
+def test_parser_records_bad_member():
+    parser = IncrementalJsonParser()
+    parser.feed('{"rating":"BUY","confidence":7x2,"timeframe":"SWING"}')
+
+    assert parser.complete
+    assert len(parser.errors) == 1
+    assert "confidence" not in parser.fields
+
+
+class _FakeMessages:
+    """Stands in for client.messages, recording requests"""
+
+    def __init__(self, text):
+        self.text = text
+        self.requests = []
+
+    async def create(self, **request):
+        self.requests.append(request)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+class _FakeStream:
+    """Async context manager yielding a scripted response in small chunks"""
+
+    def __init__(self, text, pause_after=None, gate=None):
+        self.text = text
+        self.pause_after = pause_after
+        self.gate = gate
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for i in range(0, len(self.text), 4):
+            if self.gate and i >= self.pause_after:
+                await self.gate.wait()
+            yield self.text[i:i + 4]
+
+
+class _FakeStreamingMessages:
+    """Stands in for client.messages, replaying one scripted stream per call"""
+
+    def __init__(self, *streams):
+        self.streams = list(streams)
+
+    def stream(self, **request):
+        stream = self.streams.pop(0)
+        if isinstance(stream, Exception):
+            raise stream
+        return stream
+
+
+_PRICE = CoinPrice(
+    symbol="BTC", price=100, change_24h=1, volume_24h=1, high_24h=1, low_24h=1
+)
+_TECHNICAL = TechnicalIndicators(
+    rsi=50, macd=0, macd_signal=0, macd_histogram=1,
+    bb_upper=110, bb_middle=100, bb_lower=90,
+)
+_RESPONSE = orjson.dumps(
+    {"rating": "BUY", "confidence": 70, "timeframe": "SWING", "reasoning": "r" * 200}
+).decode()
+
+
+def _futures(*names):
+    loop = asyncio.get_running_loop()
+    return {name: loop.create_future() for name in names}
+
+
+def _analyzer_with(messages):
+    analyzer = ClaudeAnalyzer()
+    analyzer._client = SimpleNamespace(messages=messages)
+    return analyzer
+
+
+def test_explain_trade_non_str_keys():
+    messages = _FakeMessages("Because.")
+    analyzer = _analyzer_with(messages)
+    context = {1: "a", SignalType.BUY: {2: 3.5}, "rsi": 28}
+
+    first = asyncio.run(analyzer.explain_trade("BTC", SignalType.BUY, context))
+    second = asyncio.run(analyzer.explain_trade("BTC", SignalType.BUY, context))
+
+    assert first == second == "Because."
+    assert len(messages.requests) == 1  # Second call served from the cache
+    assert '"1": "a"' in messages.requests[0]["messages"][0]["content"]
+
+
+def test_explain_trade_unserializable_context_falls_back():
+    messages = _FakeMessages("Because.")
+    analyzer = _analyzer_with(messages)
+
+    explanation = asyncio.run(
+        analyzer.explain_trade("BTC", SignalType.BUY, {(1, 2): "tuple key"})
+    )
+
+    assert explanation == "Unable to generate explanation for BTC BUY signal."
+    assert messages.requests == []
+
+
+def test_field_futures_resolve_before_stream_ends():
+    async def run():
+        gate = asyncio.Event()
+        stream = _FakeStream(
+            _RESPONSE, pause_after=_RESPONSE.index('"reasoning"'), gate=gate
+        )
+        analyzer = _analyzer_with(_FakeStreamingMessages(stream))
+        futures = _futures("rating", "confidence", "stop_loss")
+
+        task = asyncio.create_task(
+            analyzer.analyze_coin("BTC", _PRICE, _TECHNICAL, field_futures=futures)
+        )
+        rating = await asyncio.wait_for(futures["rating"], timeout=1)
+        confidence = await futures["confidence"]
+        assert not task.done()  # Reasoning hasn't streamed yet
+
+        gate.set()
+        analysis = await task
+        return rating, confidence, futures["stop_loss"].result(), analysis
+
+    rating, confidence, stop_loss, analysis = asyncio.run(run())
+
+    assert rating is SignalType.BUY
+    assert confidence == 70
+    assert stop_loss is None  # Never streamed; resolved from the analysis
+    assert analysis.rating is SignalType.BUY
+
+
+def test_field_futures_skip_invalid_streamed_values():
+    invalid = _RESPONSE.replace('"confidence":70', '"confidence":700')
+
+    async def run():
+        analyzer = _analyzer_with(
+            _FakeStreamingMessages(_FakeStream(invalid), _FakeStream(_RESPONSE))
+        )
+        futures = _futures("confidence")
+        analysis = await analyzer.analyze_coin(
+            "BTC", _PRICE, _TECHNICAL, field_futures=futures
+        )
+        return futures["confidence"].result(), analysis
+
+    confidence, analysis = asyncio.run(run())
+
+    # 700 fails the field schema, so the future waits for the repaired value
+    assert confidence == analysis.confidence == 70
+
+
+def test_field_futures_follow_hold_fallback_on_error():
+    async def run():
+        analyzer = _analyzer_with(_FakeStreamingMessages(ValueError("boom")))
+        futures = _futures("rating", "confidence")
+        analysis = await analyzer.analyze_coin(
+            "BTC", _PRICE, _TECHNICAL, field_futures=futures
+        )
+        return {name: f.result() for name, f in futures.items()}, analysis
+
+    resolved, analysis = asyncio.run(run())
+
+    assert analysis.rating is SignalType.HOLD
+    assert resolved == {"rating": SignalType.HOLD, "confidence": 0}
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from api.rate_limiter import RateLimiter
+
+
+def test_status_reports_local_buckets():
+    async def run():
+        limiter = RateLimiter()
+        for _ in range(10):
+            await limiter.acquire("coingecko")
+        return await limiter.get_status()
+
+    status = asyncio.run(run())["coingecko"]
+
+    assert status["backend"] == "local"
+    assert status["available_tokens"] == pytest.approx(35, abs=0.1)
+
+
+def test_status_reports_shared_redis_buckets():
+    aioredis = pytest.importorskip("fakeredis.aioredis")
+
+    async def run():
+        limiter = RateLimiter()
+        limiter.use_redis(aioredis.FakeRedis())
+        for _ in range(10):
+            await limiter.acquire("coingecko")
+        return await limiter.get_status()
+
+    status = asyncio.run(run())
+
+    # Tokens came from Redis, not the (untouched) local bucket
+    assert status["coingecko"]["backend"] == "redis"
+    assert status["coingecko"]["available_tokens"] == pytest.approx(35, abs=0.1)
+    assert status["coingecko"]["stats"]["total_requests"] == 10
+    assert status["binance"]["available_tokens"] == pytest.approx(1100)
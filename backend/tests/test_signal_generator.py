@@ -0,0 +1,112 @@
+import random
+
+import pytest
+
+from ai_agent.signal_generator import signal_generator
+from data.models import (
+    AIAnalysis,
+    CoinPrice,
+    MacroContext,
+    SignalType,
+    TechnicalIndicators,
+    Timeframe,
+)
+
+
+def _maybe(rng, value, p=0.2):
+    return None if rng.random() < p else value
+
+
+def _pick(rng, edges, low, high):
+    """A table edge half the time (where bisect/searchsorted could disagree)"""
+    return rng.choice(edges) if rng.random() < 0.5 else rng.uniform(low, high)
+
+
+def _random_inputs(rng, n):
+    coins, prices, technicals, analyses, macros = [], [], [], [], []
+
+    for i in range(n):
+        coins.append(f"C{i}")
+        prices.append(
+            CoinPrice(
+                symbol="X",
+                price=rng.uniform(1, 100),
+                change_24h=_pick(rng, [-10, -5, 0, 5, 10], -15, 15),
+                volume_24h=1,
+                high_24h=1,
+                low_24h=1,
+            )
+        )
+
+        middle = rng.uniform(80, 120)
+        technicals.append(
+            TechnicalIndicators(
+                rsi=_pick(rng, [0, 30, 40, 60, 70, 100], 0, 100),
+                macd=0,
+                macd_signal=0,
+                macd_histogram=_pick(rng, [0], -1, 1),
+                bb_upper=_maybe(rng, middle * rng.uniform(0.9, 1.2)) or 0,
+                bb_middle=rng.choice([0, middle]),
+                bb_lower=middle * rng.uniform(0.8, 1.1),
+                ema_20=_maybe(rng, rng.uniform(80, 120)),
+                ema_50=_maybe(rng, rng.uniform(80, 120)),
+                ema_200=_maybe(rng, rng.uniform(80, 120)),
+                volume_ratio=_maybe(rng, _pick(rng, [1, 1.5, 2], 0, 3)),
+            )
+        )
+
+        analyses.append(
+            _maybe(
+                rng,
+                AIAnalysis(
+                    coin="X",
+                    rating=rng.choice(list(SignalType)),
+                    confidence=rng.randint(0, 100),
+                    timeframe=Timeframe.SWING,
+                    reasoning="r",
+                    entry_zone_low=_maybe(rng, 1.0, 0.5),
+                    entry_zone_high=2.0,
+                ),
+                0.3,
+            )
+        )
+
+        macros.append(
+            _maybe(
+                rng,
+                MacroContext(
+                    dxy=_maybe(rng, _pick(rng, [95, 100, 105, 110], 85, 120)),
+                    vix=_maybe(rng, _pick(rng, [15, 20, 25, 30], 5, 40)),
+                    fear_greed_index=_maybe(
+                        rng, rng.choice([25, 40, 60, 75, rng.randint(0, 100)])
+                    ),
+                ),
+                0.4,
+            )
+        )
+
+    return coins, prices, technicals, analyses, macros
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_batch_matches_scalar(seed):
+    coins, prices, technicals, analyses, macros = _random_inputs(
+        random.Random(seed), 1000
+    )
+
+    batch = signal_generator.generate_signals_batch(
+        coins, prices, technicals, analyses, macros
+    )
+
+    assert len(batch) == len(coins)
+    for i, batched in enumerate(batch):
+        scalar = signal_generator.generate_signal(
+            coins[i], prices[i], technicals[i], analyses[i], macros[i]
+        )
+        assert batched.model_dump(exclude={"timestamp"}) == scalar.model_dump(
+            exclude={"timestamp"}
+        ), coins[i]
+
+
+def test_batch_empty():
+    assert signal_generator.generate_signals_batch([], [], []) == []